@@ -1,11 +1,83 @@
-"""Pytest configuration for integration tests."""
+"""Pytest configuration for integration tests.
+
+Tests marked ``@pytest.mark.source_cached("pkg.module", ...)`` are skipped
+when none of the listed modules, the test's own module, or this conftest
+changed since the test last passed. Pass ``--no-skip-cached-tests`` to force
+them to run.
+
+Runs under pytest-xdist (``-n auto``) default to ``--dist loadgroup`` so tests
+sharing an ``xdist_group`` stay on one worker.
+"""
+
+import hashlib
+import importlib
+import inspect
+from pathlib import Path
 
 import pytest
 
+# Prefix of the per-test cache entries; one entry per test means xdist
+# workers never overwrite each other's results
+CACHE_KEY = "orca_lift/testhash"
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_cmdline_main(config):
+    # Runs before xdist's own hook, which would otherwise pick plain "load";
+    # an explicit --dist is left alone, and nothing happens without xdist
+    if not config.pluginmanager.hasplugin("xdist"):
+        return
+    if config.option.numprocesses and config.option.dist == "no":
+        config.option.dist = "loadgroup"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--no-skip-cached-tests",
+        action="store_true",
+        default=False,
+        help="Run source_cached tests even if their modules are unchanged.",
+    )
+
+
+def _source_digest(item, module_names: tuple[str, ...]) -> str:
+    """Hash the source of the given modules, the test's module and this conftest."""
+    digest = hashlib.blake2b(digest_size=16)
+    for name in sorted(module_names):
+        digest.update(inspect.getsource(importlib.import_module(name)).encode())
+    digest.update(inspect.getsource(item.module).encode())
+    digest.update(Path(__file__).read_bytes())
+    return digest.hexdigest()
+
+
+def _cache_key(item) -> str:
+    """Cache key holding the digest the item last passed with."""
+    return f"{CACHE_KEY}/{hashlib.blake2b(item.nodeid.encode(), digest_size=8).hexdigest()}"
+
+
+def _cached_digest(item) -> str | None:
+    """Return the source digest for a source_cached item, or None if not applicable."""
+    marker = item.get_closest_marker("source_cached")
+    if marker is None or getattr(item.config, "cache", None) is None:
+        return None
+    if not hasattr(item, "_source_digest"):
+        item._source_digest = _source_digest(item, marker.args)
+    return item._source_digest
+
+
+def pytest_runtest_setup(item):
+    if item.config.getoption("--no-skip-cached-tests"):
+        return
+    digest = _cached_digest(item)
+    if digest is not None and item.config.cache.get(_cache_key(item), None) == digest:
+        pytest.skip("cached: no relevant changes")
+
 
-# Mark all tests in this directory as integration tests
-def pytest_collection_modifyitems(items):
-    """Add integration marker to all tests in this directory."""
-    for item in items:
-        if "integration_tests" in str(item.fspath):
-            item.add_marker(pytest.mark.integration)
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item, call):
+    report = yield
+    if report.when == "call" and report.passed:
+        digest = _cached_digest(item)
+        if digest is not None:
+            item.config.cache.set(_cache_key(item), digest)
+    return report
@@ -4,6 +4,8 @@ These tests require API access and are meant to verify the full flow works.
 Mark as slow/integration tests to skip in regular test runs.
 """
 
+import asyncio
+
 import pytest
 
 from orca_lift.generators.liftoscript import LiftoscriptGenerator
@@ -23,10 +25,15 @@ from orca_lift.models.user_profile import (
     UserProfile,
 )
 
+pytestmark = pytest.mark.integration
+
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_user_profile():
-    """Create a sample user profile for testing."""
+    """Create a sample user profile for testing.
+
+    Session-scoped: tests only read from it. Copy it locally before mutating.
+    """
     return UserProfile(
         name="Test User",
         experience_level=ExperienceLevel.INTERMEDIATE,
@@ -47,9 +54,64 @@ def sample_user_profile():
     )
 
 
+def _make_program(name: str, num_weeks: int = 1, num_days: int = 1) -> Program:
+    """Build a program with the given number of weeks and days per week."""
+    return Program(
+        name=name,
+        description="Testing serialization",
+        goals="Test goals",
+        weeks=[
+            ProgramWeek(
+                week_number=week,
+                deload=week == num_weeks and num_weeks > 1,
+                phase_name="Accumulation",
+                days=[
+                    ProgramDay(
+                        name=f"Day {day}",
+                        focus="Full Body",
+                        exercises=[
+                            ProgramExercise(
+                                name="Squat",
+                                sets=[
+                                    SetScheme(reps=5, rpe=8),
+                                    SetScheme(reps="5+", is_amrap=True),
+                                ],
+                                progression=ProgressionScheme.LINEAR,
+                                progression_params={"increment": 5},
+                            ),
+                            ProgramExercise(
+                                name="Romanian Deadlift",
+                                sets=[SetScheme(reps="8-10", rest_seconds=120) for _ in range(3)],
+                                substitutions=["Good Morning"],
+                                cues=["Hinge at the hips"],
+                            ),
+                        ],
+                    )
+                    for day in range(1, num_days + 1)
+                ],
+            )
+            for week in range(1, num_weeks + 1)
+        ],
+        congregation_log=[{"phase": "test", "output": "test data"}],
+    )
+
+
+@pytest.fixture(scope="module")
+def roundtrip_programs():
+    """Programs of different shapes for serialization roundtrips."""
+    return {
+        "single": _make_program("Roundtrip Test"),
+        "empty_week": _make_program("Empty Week", num_days=0),
+        "multi_week": _make_program("Multi Week", num_weeks=4, num_days=3),
+    }
+
+
 class TestPipelineIntegration:
     """Integration tests for the full generation pipeline."""
 
+    @pytest.mark.source_cached(
+        "orca_lift.generators.liftoscript", "orca_lift.models.program"
+    )
     def test_profile_to_liftoscript_flow(self, sample_user_profile):
         """Test that we can create a program and generate valid Liftoscript."""
         # Create a mock program (simulating AI output)
@@ -132,31 +194,11 @@ class TestPipelineIntegration:
         assert "lp(" in liftoscript
         assert "dp(" in liftoscript
 
-    def test_program_roundtrip(self):
+    @pytest.mark.source_cached("orca_lift.models.program")
+    @pytest.mark.parametrize("shape", ["single", "empty_week", "multi_week"])
+    def test_program_roundtrip(self, roundtrip_programs, shape):
         """Test that program can be serialized and deserialized."""
-        original = Program(
-            name="Roundtrip Test",
-            description="Testing serialization",
-            goals="Test goals",
-            weeks=[
-                ProgramWeek(
-                    week_number=1,
-                    days=[
-                        ProgramDay(
-                            name="Day 1",
-                            exercises=[
-                                ProgramExercise(
-                                    name="Squat",
-                                    sets=[SetScheme(reps=5, rpe=8)],
-                                    progression=ProgressionScheme.LINEAR,
-                                )
-                            ],
-                        )
-                    ],
-                )
-            ],
-            congregation_log=[{"phase": "test", "output": "test data"}],
-        )
+        original = roundtrip_programs[shape]
 
         # Serialize
         data = original.to_dict()
@@ -164,61 +206,104 @@ class TestPipelineIntegration:
         # Deserialize
         restored = Program.from_dict(data)
 
-        assert restored.name == original.name
-        assert restored.goals == original.goals
-        assert len(restored.weeks) == len(original.weeks)
-        assert restored.weeks[0].days[0].exercises[0].name == "Squat"
+        assert restored == original
+
+
+class _RoundTrips:
+    """AI round-trips keyed by test name, each started at most once."""
+
+    def __init__(self, starters: dict):
+        self._starters = starters
+        self.tasks: dict[str, asyncio.Task] = {}
+
+    def start(self, name: str) -> asyncio.Task:
+        if name not in self.tasks:
+            self.tasks[name] = asyncio.create_task(self._starters[name]())
+        return self.tasks[name]
+
+
+def _may_skip(item) -> bool:
+    return any(item.iter_markers("skip")) or any(item.iter_markers("skipif"))
+
+
+@pytest.fixture(scope="session")
+async def ai_round_trips(request, sample_user_profile):
+    """AI round-trips for the TestAIPipeline tests, started together.
+
+    The calls of selected tests without skip marks start up front, so they
+    overlap and the tests take as long as the slowest call rather than their
+    sum, while a failure in one does not hide the other. Any other test's call
+    starts when the test first asks for it, so a skipped test never costs an
+    API call.
+    """
+    from orca_lift.agents import ProgramExecutor
+    from orca_lift.services.refine import RefinementService
+
+    # Create a simple program to refine
+    program = Program(
+        name="Test",
+        description="",
+        goals="",
+        weeks=[
+            ProgramWeek(
+                week_number=1,
+                days=[
+                    ProgramDay(
+                        name="Day 1",
+                        focus="Push",
+                        exercises=[
+                            ProgramExercise(
+                                name="Bench Press",
+                                sets=[SetScheme(reps=5) for _ in range(4)],
+                            )
+                        ],
+                    )
+                ],
+            )
+        ],
+    )
+
+    starters = {
+        "test_full_generation": lambda: ProgramExecutor(verbose=False).execute(
+            user_profile=sample_user_profile,
+            goals="Build strength, 4 days per week",
+        ),
+        "test_refinement": lambda: RefinementService().refine(program, "Add tricep work"),
+    }
+    round_trips = _RoundTrips(starters)
+    for item in request.session.items:
+        if item.originalname in starters and not _may_skip(item):
+            round_trips.start(item.originalname)
+    yield round_trips
+
+    for task in round_trips.tasks.values():
+        task.cancel()
+    await asyncio.gather(*round_trips.tasks.values(), return_exceptions=True)
 
 
 @pytest.mark.skip(reason="Requires API access")
+@pytest.mark.xdist_group(name="ai_api")
 class TestAIPipeline:
     """Tests that require actual API calls."""
 
-    async def test_full_generation(self, sample_user_profile):
+    @pytest.mark.api
+    @pytest.mark.slow
+    @pytest.mark.network
+    async def test_full_generation(self, ai_round_trips):
         """Test full program generation with AI."""
-        from orca_lift.agents import ProgramExecutor
-
-        executor = ProgramExecutor(verbose=False)
-        result = await executor.execute(
-            user_profile=sample_user_profile,
-            goals="Build strength, 4 days per week",
-        )
+        result = await ai_round_trips.start("test_full_generation")
 
         assert result.program is not None
         assert len(result.program.weeks) > 0
         assert result.liftoscript is not None
         assert len(result.liftoscript) > 0
 
-    async def test_refinement(self, sample_user_profile):
+    @pytest.mark.api
+    @pytest.mark.slow
+    @pytest.mark.network
+    async def test_refinement(self, ai_round_trips):
         """Test program refinement."""
-        from orca_lift.services.refine import RefinementService
-
-        # Create a simple program
-        program = Program(
-            name="Test",
-            description="",
-            goals="",
-            weeks=[
-                ProgramWeek(
-                    week_number=1,
-                    days=[
-                        ProgramDay(
-                            name="Day 1",
-                            focus="Push",
-                            exercises=[
-                                ProgramExercise(
-                                    name="Bench Press",
-                                    sets=[SetScheme(reps=5) for _ in range(4)],
-                                )
-                            ],
-                        )
-                    ],
-                )
-            ],
-        )
-
-        service = RefinementService()
-        refined = await service.refine(program, "Add tricep work")
+        refined = await ai_round_trips.start("test_refinement")
 
         # Check that something changed
         assert refined is not None
@@ -5,21 +5,37 @@ This script fetches the latest exercise definitions from Liftosaur's
 open-source repo and outputs them in a format we can use.
 
 Usage:
-    uv run python scripts/sync_liftosaur_exercises.py
+    uv run python scripts/sync_liftosaur_exercises.py [--stdout]
 
 Source: https://github.com/astashov/liftosaur
 """
 
+import argparse
+import contextlib
 import json
 import re
+import sys
+import urllib.error
 import urllib.request
 from dataclasses import dataclass
+from pathlib import Path
+from typing import TextIO
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 LIFTOSAUR_EXERCISE_URL = (
     "https://raw.githubusercontent.com/astashov/liftosaur/master/src/models/exercise.ts"
 )
 
+# Local copy of the last download, revalidated with its ETag on each run
+CACHE_DIR = Path(__file__).parent / ".cache"
+CACHE_FILE = CACHE_DIR / "exercise.ts"
+ETAG_FILE = CACHE_DIR / "exercise.ts.etag"
+
 # Map Liftosaur equipment names to display names (for Liftoscript format)
 EQUIPMENT_DISPLAY = {
     "barbell": "Barbell",
@@ -50,8 +66,25 @@ EQUIPMENT_TO_ENUM = {
     "medicineball": "medicine_ball",
 }
 
+# Exercise list entries: id: { id: "...", name: "...", ... }
+EXERCISE_PATTERN = re.compile(r'(\w+):\s*\{\s*id:\s*"(\w+)",\s*name:\s*"([^"]+)"')
+
+# Metadata entries:
+# exerciseId: { targetMuscles: [...], synergistMuscles: [...],
+#               bodyParts: [...], sortedEquipment: [...] }
+METADATA_PATTERN = re.compile(
+    r"(\w+):\s*\{\s*targetMuscles:\s*\[([^\]]*)\],\s*synergistMuscles:\s*\[([^\]]*)\],"
+    r"\s*bodyParts:\s*\[([^\]]*)\],\s*sortedEquipment:\s*\[([^\]]*)\]"
+)
+
+# Quoted string literals inside a TypeScript array
+STRING_LITERAL_PATTERN = re.compile(r'"([^"]+)"')
+
+# Uppercase letters in camelCase ids, for the Title Case fallback name
+CAMEL_CASE_PATTERN = re.compile(r"([A-Z])")
 
-@dataclass
+
+@dataclass(slots=True)
 class LiftosaurExercise:
     """Exercise from Liftosaur."""
 
@@ -64,10 +97,43 @@ class LiftosaurExercise:
 
 
 def fetch_exercise_file() -> str:
-    """Fetch the exercise.ts file from Liftosaur's GitHub."""
+    """Fetch the exercise.ts file from Liftosaur's GitHub.
+
+    The download is cached in scripts/.cache with its ETag. Later runs send
+    If-None-Match and reuse the cached copy when the server returns 304.
+    """
     print(f"Fetching exercises from: {LIFTOSAUR_EXERCISE_URL}")
-    with urllib.request.urlopen(LIFTOSAUR_EXERCISE_URL) as response:
-        return response.read().decode("utf-8")
+    request = urllib.request.Request(LIFTOSAUR_EXERCISE_URL)
+    if CACHE_FILE.exists() and ETAG_FILE.exists():
+        request.add_header("If-None-Match", ETAG_FILE.read_text().strip())
+
+    try:
+        with urllib.request.urlopen(request) as response:
+            body = response.read()
+            etag = response.headers.get("ETag")
+    except urllib.error.HTTPError as e:
+        if e.code != 304:
+            raise
+        print("Not modified, using cached copy")
+        return CACHE_FILE.read_text(encoding="utf-8")
+
+    CACHE_DIR.mkdir(exist_ok=True)
+    CACHE_FILE.write_bytes(body)
+    if etag:
+        ETAG_FILE.write_text(etag)
+    else:
+        ETAG_FILE.unlink(missing_ok=True)
+
+    return body.decode("utf-8")
+
+
+def _exercise_name(exercise_id: str, exercise_names: dict[str, str]) -> str:
+    """Look up an exercise's display name, falling back to its Title Cased id."""
+    name = exercise_names.get(exercise_id)
+    if name is None:
+        # Convert camelCase to Title Case
+        name = CAMEL_CASE_PATTERN.sub(r" \1", exercise_id).strip().title()
+    return name
 
 
 def parse_exercises(content: str) -> list[LiftosaurExercise]:
@@ -75,53 +141,29 @@ def parse_exercises(content: str) -> list[LiftosaurExercise]:
 
     Parses both allExercisesList (for id and name) and metadata (for equipment).
     """
-    exercises = []
-
     # Parse exercise list: id: { id: "...", name: "...", ... }
-    exercise_pattern = r'(\w+):\s*\{\s*id:\s*"(\w+)",\s*name:\s*"([^"]+)"'
-    exercise_matches = {
-        m.group(1): {"id": m.group(2), "name": m.group(3)}
-        for m in re.finditer(exercise_pattern, content)
-    }
+    exercise_names = {m.group(1): m.group(3) for m in EXERCISE_PATTERN.finditer(content)}
 
     # Parse metadata: exerciseId: { ..., sortedEquipment: [...], ... }
     metadata_start = content.find("export const metadata")
     if metadata_start < 0:
         print("Warning: Could not find metadata section")
-        return exercises
+        return []
 
     metadata_section = content[metadata_start:]
-
-    # For each exercise in metadata, extract sortedEquipment
-    # Pattern: exerciseId: { targetMuscles: [...], synergistMuscles: [...], bodyParts: [...], sortedEquipment: [...] }
-    metadata_pattern = r'(\w+):\s*\{\s*targetMuscles:\s*\[([^\]]*)\],\s*synergistMuscles:\s*\[([^\]]*)\],\s*bodyParts:\s*\[([^\]]*)\],\s*sortedEquipment:\s*\[([^\]]*)\]'
-
-    for match in re.finditer(metadata_pattern, metadata_section):
-        exercise_id = match.group(1)
-        target_muscles = [s.strip().strip('"') for s in match.group(2).split(",") if s.strip()]
-        synergist_muscles = [s.strip().strip('"') for s in match.group(3).split(",") if s.strip()]
-        body_parts = [s.strip().strip('"') for s in match.group(4).split(",") if s.strip()]
-        equipment = [s.strip().strip('"') for s in match.group(5).split(",") if s.strip()]
-
-        # Get exercise name from allExercisesList
-        if exercise_id in exercise_matches:
-            name = exercise_matches[exercise_id]["name"]
-        else:
-            # Convert camelCase to Title Case
-            name = re.sub(r"([A-Z])", r" \1", exercise_id).strip().title()
-
-        exercises.append(
-            LiftosaurExercise(
-                id=exercise_id,
-                name=name,
-                equipment_types=equipment,
-                target_muscles=target_muscles,
-                synergist_muscles=synergist_muscles,
-                body_parts=body_parts,
-            )
+    findall = STRING_LITERAL_PATTERN.findall
+
+    return [
+        LiftosaurExercise(
+            id=match.group(1),
+            name=_exercise_name(match.group(1), exercise_names),
+            equipment_types=findall(match.group(5)),
+            target_muscles=findall(match.group(2)),
+            synergist_muscles=findall(match.group(3)),
+            body_parts=findall(match.group(4)),
         )
-
-    return exercises
+        for match in METADATA_PATTERN.finditer(metadata_section)
+    ]
 
 
 def generate_liftosaur_names(exercises: list[LiftosaurExercise]) -> list[str]:
@@ -129,18 +171,62 @@ def generate_liftosaur_names(exercises: list[LiftosaurExercise]) -> list[str]:
 
     Liftosaur format: "Exercise Name, Equipment Type"
     """
-    names = []
-    for ex in exercises:
-        for equip in ex.equipment_types:
-            display_equip = EQUIPMENT_DISPLAY.get(equip, equip.title())
-            full_name = f"{ex.name}, {display_equip}"
-            names.append(full_name)
+    display = EQUIPMENT_DISPLAY.get
+    names = {
+        f"{ex.name}, {display(equip, equip.title())}"
+        for ex in exercises
+        for equip in ex.equipment_types
+    }
+    return sorted(names)
+
+
+def build_payload(exercises: list[LiftosaurExercise], all_names: list[str]) -> dict:
+    """Build the JSON document written to liftosaur_exercises.json."""
+    return {
+        "source": "https://github.com/astashov/liftosaur",
+        "exercises": [
+            {
+                "id": ex.id,
+                "name": ex.name,
+                "equipment": ex.equipment_types,
+                "equipment_display": [
+                    EQUIPMENT_DISPLAY.get(e, e) for e in ex.equipment_types
+                ],
+                "target_muscles": ex.target_muscles,
+                "body_parts": ex.body_parts,
+            }
+            for ex in exercises
+        ],
+        "valid_names": all_names,
+        "equipment_mapping": EQUIPMENT_DISPLAY,
+    }
+
 
-    return sorted(set(names))
+def encode_payload(payload: dict) -> bytes:
+    """Encode the payload as indented JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    return json.dumps(payload, indent=2).encode("utf-8")
 
 
-def main():
+def main(argv: list[str] | None = None):
     """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--stdout",
+        action="store_true",
+        help="Write the JSON to stdout instead of scripts/liftosaur_exercises.json",
+    )
+    args = parser.parse_args(argv)
+
+    # Keep stdout clean for the JSON when --stdout is given
+    stdout = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr if args.stdout else stdout):
+        _sync(stdout if args.stdout else None)
+
+
+def _sync(json_out: TextIO | None) -> None:
+    """Fetch, parse and write the exercise list, printing a summary."""
     content = fetch_exercise_file()
     exercises = parse_exercises(content)
 
@@ -151,31 +237,15 @@ def main():
     print(f"Generated {len(all_names)} exercise+equipment combinations")
 
     # Output as JSON for easy consumption
-    output_file = "scripts/liftosaur_exercises.json"
-    with open(output_file, "w") as f:
-        json.dump(
-            {
-                "source": "https://github.com/astashov/liftosaur",
-                "exercises": [
-                    {
-                        "id": ex.id,
-                        "name": ex.name,
-                        "equipment": ex.equipment_types,
-                        "equipment_display": [
-                            EQUIPMENT_DISPLAY.get(e, e) for e in ex.equipment_types
-                        ],
-                        "target_muscles": ex.target_muscles,
-                        "body_parts": ex.body_parts,
-                    }
-                    for ex in exercises
-                ],
-                "valid_names": all_names,
-                "equipment_mapping": EQUIPMENT_DISPLAY,
-            },
-            f,
-            indent=2,
-        )
-    print(f"\nSaved to {output_file}")
+    data = encode_payload(build_payload(exercises, all_names))
+    if json_out is not None:
+        json_out.write(data.decode("utf-8"))
+        json_out.flush()
+    else:
+        output_file = "scripts/liftosaur_exercises.json"
+        with open(output_file, "wb") as f:
+            f.write(data)
+        print(f"\nSaved to {output_file}")
 
     # Print sample
     print("\nSample valid exercise names:")
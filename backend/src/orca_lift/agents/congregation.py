@@ -2,6 +2,7 @@
 
 from collections.abc import AsyncGenerator
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Callable, Awaitable
 
 from orca import (
@@ -17,6 +18,11 @@ from orca import (
 )
 from orca.clients.claude_agent_client import ClaudeAgentClient
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 from .output_specs import final_program_specs
 from .prompts import (
     DEFAULT_EQUIPMENT_CONSTRAINTS,
@@ -38,7 +44,7 @@ from .tools import (
 EventCallback = Callable[[CongregationEvent], Awaitable[None]] | None
 
 
-@dataclass
+@dataclass(slots=True)
 class CongregationResult:
     """Result from congregation deliberation."""
 
@@ -48,37 +54,49 @@ class CongregationResult:
     converged: bool
 
 
+# (client_id, persona_name, prompt_template) for each specialist
+SPECIALISTS = (
+    ("strength_coach", "Strength Coach", STRENGTH_COACH_SYSTEM),
+    ("hypertrophy_expert", "Hypertrophy Expert", HYPERTROPHY_EXPERT_SYSTEM),
+    ("periodization_specialist", "Periodization Specialist", PERIODIZATION_SPECIALIST_SYSTEM),
+    ("recovery_analyst", "Recovery Analyst", RECOVERY_ANALYST_SYSTEM),
+)
+
+SPECIALIST_GLOBAL_RULES = (
+    "ABSOLUTE RULE: Never call ask_human for data that exists in the user profile. "
+    "Equipment, 1RM values, body weight, age, and height are already stored — "
+    "use get_user_profile(), get_strength_levels(), or get_available_equipment() instead. "
+    "If data is missing from the profile, proceed without it. "
+    "Only use ask_human for questions the profile cannot answer, such as exercise preferences or event goals."
+)
+
+
+@lru_cache(maxsize=8)
+def _specialist_prompts(constraints: str) -> tuple[str, ...]:
+    """Format each specialist's prompt with the given equipment constraints."""
+    return tuple(
+        prompt_template.format(equipment_constraints=constraints)
+        for _, _, prompt_template in SPECIALISTS
+    )
+
+
 def create_specialist_clients(
     equipment_constraints: str | None = None,
 ) -> list[ConversationClient]:
     """Create the specialist conversation clients for program design.
 
+    Formatted prompts are cached per constraints string; the clients
+    themselves hold per-run conversation state and are always fresh.
+
     Args:
         equipment_constraints: Formatted equipment constraints string
             to inject into each specialist's prompt
     """
     constraints = equipment_constraints or DEFAULT_EQUIPMENT_CONSTRAINTS
-
-    specialists = [
-        ("strength_coach", "Strength Coach", STRENGTH_COACH_SYSTEM),
-        ("hypertrophy_expert", "Hypertrophy Expert", HYPERTROPHY_EXPERT_SYSTEM),
-        ("periodization_specialist", "Periodization Specialist", PERIODIZATION_SPECIALIST_SYSTEM),
-        ("recovery_analyst", "Recovery Analyst", RECOVERY_ANALYST_SYSTEM),
-    ]
-
-    global_rules = (
-        "ABSOLUTE RULE: Never call ask_human for data that exists in the user profile. "
-        "Equipment, 1RM values, body weight, age, and height are already stored — "
-        "use get_user_profile(), get_strength_levels(), or get_available_equipment() instead. "
-        "If data is missing from the profile, proceed without it. "
-        "Only use ask_human for questions the profile cannot answer, such as exercise preferences or event goals."
-    )
+    prompts = _specialist_prompts(constraints)
 
     clients = []
-    for client_id, name, prompt_template in specialists:
-        # Inject equipment constraints into prompt
-        prompt = prompt_template.format(equipment_constraints=constraints)
-
+    for (client_id, name, _), prompt in zip(SPECIALISTS, prompts):
         agent_client = ClaudeAgentClient(permission_mode=PermissionMode.DEFAULT)
         clients.append(
             ConversationClient(
@@ -88,7 +106,7 @@ def create_specialist_clients(
                 agent_client=agent_client,
                 model_type=ModelType.SONNET,
                 web=True,
-                global_rules=global_rules,
+                global_rules=SPECIALIST_GLOBAL_RULES,
             )
         )
 
@@ -120,6 +138,7 @@ def create_congregation(
     equipment_constraints: str | None = None,
     tools: list[CongregationTool] | None = None,
     constraint_checklist: str = "",
+    clients: list[ConversationClient] | None = None,
 ) -> Congregation:
     """Create the full congregation for program generation.
 
@@ -128,8 +147,11 @@ def create_congregation(
         equipment_constraints: Formatted equipment constraints string
         tools: Optional list of CongregationTool objects for info requests
         constraint_checklist: Formatted constraint checklist for the mediator
+        clients: Specialist clients created ahead of time; built from
+            equipment_constraints if omitted
     """
-    clients = create_specialist_clients(equipment_constraints=equipment_constraints)
+    if clients is None:
+        clients = create_specialist_clients(equipment_constraints=equipment_constraints)
     mediator_config = create_mediator_config(constraint_checklist=constraint_checklist)
 
     # Use provided tools or default congregation tools
@@ -146,24 +168,19 @@ def create_congregation(
     )
 
 
-def _build_topic(
-    user_summary: str,
-    program_framework: dict,
-    num_weeks: int = 4,
-) -> str:
-    """Build the deliberation topic string."""
-    return f"""Design a complete training program for the following user:
+# Deliberation topic; framework fields fall back to TOPIC_DEFAULTS
+TOPIC_TEMPLATE = """Design a complete training program for the following user:
 
 {user_summary}
 
 HARD REQUIREMENT — Program length: EXACTLY {num_weeks} weeks. The mediator's final `weeks` array MUST contain {num_weeks} week entries (week_number 1 through {num_weeks}). Specialists must scope their recommendations (phases, deload placement, RPE ramps) to fit inside {num_weeks} weeks.
 
 Proposed Framework:
-- Split: {program_framework.get('split_type', 'TBD')}
-- Days/week: {program_framework.get('days_per_week', 'TBD')}
-- Focus areas: {', '.join(program_framework.get('day_focuses', []))}
-- Periodization: {program_framework.get('periodization', 'TBD')}
-- Progression: {program_framework.get('progression_philosophy', 'TBD')}
+- Split: {split_type}
+- Days/week: {days_per_week}
+- Focus areas: {day_focuses}
+- Periodization: {periodization}
+- Progression: {progression_philosophy}
 
 Each specialist should provide their recommendations for:
 1. Exercise selection and order
@@ -179,6 +196,27 @@ Each specialist should provide their recommendations for:
 
 The mediator should synthesize all recommendations into a complete program structure with descriptive day names (e.g., Full Body, Upper, Lower, Arms/Delts) and EXACTLY {num_weeks} weeks."""
 
+TOPIC_DEFAULTS = {
+    "split_type": "TBD",
+    "days_per_week": "TBD",
+    "day_focuses": (),
+    "periodization": "TBD",
+    "progression_philosophy": "TBD",
+}
+
+
+def _build_topic(
+    user_summary: str,
+    program_framework: dict,
+    num_weeks: int = 4,
+) -> str:
+    """Build the deliberation topic string."""
+    context = {**TOPIC_DEFAULTS, **program_framework}
+    context["day_focuses"] = ", ".join(context["day_focuses"])
+    context["user_summary"] = user_summary
+    context["num_weeks"] = num_weeks
+    return TOPIC_TEMPLATE.format_map(context)
+
 
 async def run_congregation_stream(
     user_summary: str,
@@ -187,6 +225,7 @@ async def run_congregation_stream(
     profile_id: int | None = None,
     constraint_checklist: str = "",
     num_weeks: int = 4,
+    clients: list[ConversationClient] | None = None,
 ) -> AsyncGenerator[CongregationEvent, None]:
     """Run the congregation with streaming events.
 
@@ -200,6 +239,7 @@ async def run_congregation_stream(
         profile_id: User profile ID for info request tools
         constraint_checklist: Formatted constraint checklist for the mediator
         num_weeks: Required program length in weeks
+        clients: Specialist clients created ahead of time, if any
 
     Yields:
         CongregationEvent objects for each significant event
@@ -212,6 +252,7 @@ async def run_congregation_stream(
         verbose=False,  # We're streaming instead
         equipment_constraints=equipment_constraints,
         constraint_checklist=constraint_checklist,
+        clients=clients,
     )
 
     topic = _build_topic(user_summary, program_framework, num_weeks=num_weeks)
@@ -220,6 +261,34 @@ async def run_congregation_stream(
         yield event
 
 
+def preview_text(text: str, n: int = 200) -> str:
+    """Truncate text to n characters, marking the cut with an ellipsis."""
+    return text if len(text) <= n else f"{text[:n]}..."
+
+
+def specialist_event_data(thoughts: str, aligned: bool | None) -> dict:
+    """Payload of a "specialist" progress event: a preview plus the full text."""
+    return {
+        "preview": preview_text(thoughts),
+        "full": thoughts,
+        "aligned": aligned,
+    }
+
+
+def parse_final_output(final_output: dict | str) -> dict:
+    """Return the mediator's final output as a dict.
+
+    The mediator sometimes returns the program as a JSON string instead of
+    a dict; unparseable strings yield an empty program.
+    """
+    if not isinstance(final_output, str):
+        return final_output
+    try:
+        return _json_loads(final_output)
+    except ValueError:  # json.JSONDecodeError and orjson.JSONDecodeError
+        return {}
+
+
 async def run_congregation(
     user_summary: str,
     program_framework: dict,
@@ -228,6 +297,7 @@ async def run_congregation(
     profile_id: int | None = None,
     constraint_checklist: str = "",
     num_weeks: int = 4,
+    clients: list[ConversationClient] | None = None,
 ) -> CongregationResult:
     """Run the congregation to design a program.
 
@@ -238,6 +308,7 @@ async def run_congregation(
         equipment_constraints: Formatted equipment constraints string
         profile_id: User profile ID for info request tools
         constraint_checklist: Formatted constraint checklist for the mediator
+        clients: Specialist clients created ahead of time, if any
 
     Returns:
         CongregationResult with final program and deliberation log
@@ -250,6 +321,7 @@ async def run_congregation(
         verbose=verbose,
         equipment_constraints=equipment_constraints,
         constraint_checklist=constraint_checklist,
+        clients=clients,
     )
 
     topic = _build_topic(user_summary, program_framework, num_weeks=num_weeks)
@@ -258,28 +330,17 @@ async def run_congregation(
     result = await congregation.deliberate(topic)
 
     # Build deliberation log from messages
-    deliberation_log = []
-    for msg in result.message_history:
-        deliberation_log.append({
+    deliberation_log = [
+        {
             "client_id": msg.client_id,
             "content": msg.thoughts,
             "is_aligned": msg.aligned,
-        })
-
-    # Parse final output if available
-    # Handle case where final_output is a string (JSON) instead of dict
-    final_program = {}
-    if result.final_output:
-        final_program = result.final_output
-        if isinstance(final_program, str):
-            import json
-            try:
-                final_program = json.loads(final_program)
-            except json.JSONDecodeError:
-                final_program = {}
+        }
+        for msg in result.message_history
+    ]
 
     return CongregationResult(
-        final_program=final_program,
+        final_program=parse_final_output(result.final_output or {}),
         final_thesis=result.final_thesis,
         deliberation_log=deliberation_log,
         converged=result.converged,
@@ -1,10 +1,25 @@
 """Plan execution orchestration for program generation."""
 
+import asyncio
+import copy
 import json as json_module
-from dataclasses import dataclass
-from typing import Awaitable, Callable
-
-from orca import PlanExecutor, PermissionMode
+import os
+from collections.abc import Mapping, Sequence
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Awaitable, Callable, Final
+
+from orca import (
+    AgentChat,
+    CongregationEvent,
+    CongregationEventType,
+    ConversationClient,
+    ModelType,
+    PermissionMode,
+    PlanExecutor,
+)
 
 from ..generators.liftoscript import LiftoscriptGenerator
 from ..models.program import (
@@ -12,16 +27,24 @@ from ..models.program import (
     ProgramDay,
     ProgramExercise,
     ProgramWeek,
-    ProgressionScheme,
     SetScheme,
+    parse_progression,
 )
 from ..models.user_profile import UserProfile
 from ..validators import validate_program_constraints
-from orca import CongregationEvent, CongregationEventType
-
-from .congregation import CongregationResult, run_congregation, run_congregation_stream
+from .congregation import (
+    SPECIALISTS,
+    CongregationResult,
+    create_specialist_clients,
+    parse_final_output,
+    preview_text,
+    run_congregation,
+    run_congregation_stream,
+    specialist_event_data,
+)
 from .liftoscript_converter import LiftoscriptConverter
 from .liftoscript_spec import LIFTOSCRIPT_FULL_SPEC
+from .output_specs import final_program_specs
 from .plan_builder import PlanContext, build_enrichment_plan, build_generation_plan
 from .prompts import format_constraint_checklist
 from .tools import set_current_specialist, set_question_callback
@@ -29,11 +52,222 @@ from .tools import set_current_specialist, set_question_callback
 # Max number of AI correction attempts for constraint violations
 MAX_CORRECTION_RETRIES = 2
 
+# Map client_id to friendly name
+_SPECIALIST_NAMES: Final[Mapping[str, str]] = MappingProxyType({
+    **{client_id: name for client_id, name, _ in SPECIALISTS},
+    "mediator": "Mediator",
+})
+
+# Fallback program structure used when the mediator returns no weeks.
+# Read-only so the shared template can't be modified by a caller.
+_DEFAULT_THESIS_WEEKS: Final[tuple[Mapping, ...]] = (
+    MappingProxyType({
+        "week_number": 1,
+        "is_deload": False,
+        "days": (
+            MappingProxyType({
+                "name": "Day 1",
+                "focus": "Full Body",
+                "exercises": tuple(
+                    MappingProxyType({
+                        "name": name, "sets": 3, "reps_min": 5, "reps_max": 5,
+                        "progression": "lp", "increment": 5,
+                    })
+                    for name in ("Squat", "Bench Press", "Barbell Row")
+                ),
+            }),
+        ),
+    }),
+)
+
+# Upper bound on a streamed deliberation, including time spent waiting on
+# ask_human answers. On timeout the mediator's partial output is used.
+# Override with ORCA_LIFT_CONGREGATION_TIMEOUT.
+DEFAULT_CONGREGATION_TIMEOUT_SECONDS = 1200.0
+
 # Type for progress callback: (event_type, message, data)
 ProgressCallback = Callable[[str, str, dict | None], Awaitable[None]]
 
+# Type for the non-blocking notifier used inside the pipeline
+NotifyFunc = Callable[..., None]
+
+
+def _congregation_timeout() -> float:
+    """Deliberation timeout in seconds, from ORCA_LIFT_CONGREGATION_TIMEOUT if set."""
+    value = os.environ.get("ORCA_LIFT_CONGREGATION_TIMEOUT")
+    if value is None:
+        return DEFAULT_CONGREGATION_TIMEOUT_SECONDS
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(
+            f"ORCA_LIFT_CONGREGATION_TIMEOUT must be a number of seconds, got {value!r}"
+        ) from None
+
+
+def _null_notify(event_type: str, message: str, data: dict | None = None) -> None:
+    """Notifier used when no progress callback is attached."""
+
+
+def _dicts(items: Sequence) -> list[Mapping]:
+    """Drop malformed (non-mapping) entries from a list of AI output objects."""
+    return [item for item in items if isinstance(item, Mapping)]
+
+
+def _as_int(value, default: int) -> int:
+    """Coerce an AI output value to int, falling back to default."""
+    if isinstance(value, int):
+        return value
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return default
+
 
-@dataclass
+def _set_rpe(rpe_per_set: list, index: int, rpe_target):
+    """RPE for one set: the per-set value if usable, else the uniform target."""
+    if index < len(rpe_per_set):
+        try:
+            return float(rpe_per_set[index])
+        except (ValueError, TypeError):
+            pass
+    return rpe_target
+
+
+@lru_cache(maxsize=256, typed=True)
+def _shared_set(reps, rpe, is_amrap, rest_seconds) -> SetScheme:
+    return SetScheme(reps=reps, rpe=rpe, is_amrap=is_amrap, rest_seconds=rest_seconds)
+
+
+def _make_set(reps, rpe, is_amrap, rest_seconds) -> SetScheme:
+    """SetScheme for the given values, shared between identical sets.
+
+    Most sets in a program repeat a handful of (reps, rpe) combinations, and
+    SetScheme is frozen, so one instance per combination is enough.
+    """
+    try:
+        return _shared_set(reps, rpe, is_amrap, rest_seconds)
+    except TypeError:  # unhashable value in malformed AI output
+        return SetScheme(reps=reps, rpe=rpe, is_amrap=is_amrap, rest_seconds=rest_seconds)
+
+
+def _build_exercise(ex_data) -> ProgramExercise | None:
+    """Convert one AI exercise dict to a ProgramExercise.
+
+    Returns None for malformed entries and for cardio/duration-based
+    exercises that can't be expressed in Liftoscript.
+    """
+    if not isinstance(ex_data, Mapping):
+        return None
+    if "duration_minutes" in ex_data and "reps_min" not in ex_data:
+        return None
+
+    # Build set schemes
+    num_sets = _as_int(ex_data.get("sets", 3), 3)
+    reps_min = _as_int(ex_data.get("reps_min", 5), 5)
+    reps_max = _as_int(ex_data.get("reps_max", reps_min), reps_min)
+    reps = reps_min if reps_min == reps_max else f"{reps_min}-{reps_max}"
+    is_amrap = ex_data.get("is_amrap_final_set", False)
+    rpe_target = ex_data.get("rpe_target")
+
+    # Per-set RPE from enriched data (e.g., [9, 10])
+    rpe_per_set = ex_data.get("rpe_per_set", [])
+    if not isinstance(rpe_per_set, list):
+        rpe_per_set = []
+
+    # Rest seconds from enriched data
+    rest_seconds = ex_data.get("rest_seconds")
+    if rest_seconds is not None:
+        try:
+            rest_seconds = int(rest_seconds)
+        except (ValueError, TypeError):
+            rest_seconds = None
+
+    last = num_sets - 1
+    sets = [
+        _make_set(reps, _set_rpe(rpe_per_set, i, rpe_target), i == last and is_amrap, rest_seconds)
+        for i in range(num_sets)
+    ]
+
+    # Map progression type
+    progression = parse_progression(ex_data.get("progression", "dp"))
+
+    # Coerce increment to a number
+    raw_increment = ex_data.get("increment", 5)
+    if not isinstance(raw_increment, (int, float)):
+        try:
+            raw_increment = float(raw_increment)
+        except (ValueError, TypeError):
+            raw_increment = 5
+
+    # Collect enriched metadata
+    substitutions = ex_data.get("substitutions", [])
+    if not isinstance(substitutions, list):
+        substitutions = []
+    techniques = ex_data.get("techniques", [])
+    if not isinstance(techniques, list):
+        techniques = []
+    cues = ex_data.get("cues", [])
+    if not isinstance(cues, list):
+        cues = []
+
+    return ProgramExercise(
+        name=ex_data.get("name", "Unknown"),
+        sets=sets,
+        progression=progression,
+        progression_params={
+            "increment": raw_increment,
+        },
+        notes=ex_data.get("notes", ""),
+        substitutions=substitutions,
+        techniques=techniques,
+        posture=ex_data.get("posture", "") or "",
+        position=ex_data.get("position", "") or "",
+        cues=[str(c) for c in cues if c],
+        video_url=ex_data.get("video_url", "") or "",
+    )
+
+
+class _ProgressQueue:
+    """Delivers progress events to a callback from a background task.
+
+    `notify` enqueues without awaiting the callback, so a slow consumer
+    (e.g. a streaming HTTP response) never stalls the congregation stream.
+    Events are delivered in the order they were emitted.
+    """
+
+    def __init__(self, callback: ProgressCallback):
+        self._callback = callback
+        self._queue: asyncio.Queue[tuple[str, str, dict | None]] = asyncio.Queue()
+
+    def notify(self, event_type: str, message: str, data: dict | None = None) -> None:
+        self._queue.put_nowait((event_type, message, data))
+
+    async def deliver(self) -> None:
+        """Deliver events until cancelled. A callback error propagates at once."""
+        while True:
+            event = await self._queue.get()
+            try:
+                await self._callback(*event)
+            finally:
+                self._queue.task_done()
+
+    async def join(self) -> None:
+        """Wait until every queued event has been delivered."""
+        await self._queue.join()
+
+
+@dataclass(slots=True)
+class _StreamState:
+    """Mutable state shared by the congregation stream event handlers."""
+
+    notify: NotifyFunc
+    deliberation_log: list[dict] = field(default_factory=list)
+    captured_mediator_output: dict | str | None = None  # From MEDIATOR_SYNTHESIS
+    congregation_result: CongregationResult | None = None
+
+
+@dataclass(slots=True)
 class ExecutionResult:
     """Result from plan execution."""
 
@@ -71,16 +305,50 @@ class ProgramGenerator:
             fitness_data_summary: Summary of imported fitness data
             num_weeks: Number of weeks for the program (1-6)
             equipment_constraints: Formatted equipment constraints for agents
-            on_progress: Optional callback for progress updates
+            on_progress: Optional callback for progress updates; an exception
+                it raises cancels generation and is re-raised here
 
         Returns:
             ExecutionResult with the generated program
         """
-        phase_outputs: dict[str, dict] = {}
+        if on_progress is None:
+            return await self._execute(
+                user_profile, goals, fitness_data_summary, num_weeks,
+                equipment_constraints, notify=_null_notify, streaming=False,
+            )
+
+        progress = _ProgressQueue(on_progress)
+        try:
+            # A failing callback fails the group, which cancels the pipeline
+            async with asyncio.TaskGroup() as tg:
+                delivery = tg.create_task(progress.deliver())
+                result = await self._execute(
+                    user_profile, goals, fitness_data_summary, num_weeks,
+                    equipment_constraints, notify=progress.notify, streaming=True,
+                )
+                await progress.join()
+                delivery.cancel()
+        except ExceptionGroup as group:
+            raise group.exceptions[0] from None
+        return result
+
+    async def _execute(
+        self,
+        user_profile: UserProfile,
+        goals: str,
+        fitness_data_summary: str,
+        num_weeks: int,
+        equipment_constraints: str | None,
+        notify: NotifyFunc,
+        streaming: bool,
+    ) -> ExecutionResult:
+        """Run the pipeline, reporting progress through `notify`.
 
-        async def notify(event_type: str, message: str, data: dict | None = None):
-            if on_progress:
-                await on_progress(event_type, message, data)
+        When `streaming` is set the congregation is streamed so specialist
+        events are emitted as they happen.
+        """
+        # Read before any model calls, so a bad value fails fast
+        congregation_timeout = _congregation_timeout() if streaming else None
 
         # Clamp to supported range so prompts and validators stay consistent.
         num_weeks = max(1, min(8, int(num_weeks)))
@@ -91,10 +359,10 @@ class ProgramGenerator:
 
         # Build context
         context = PlanContext(
-            user_profile=user_profile.get_summary(),
+            user_profile=user_profile.summary,
             fitness_data=fitness_data_summary or "No fitness data imported.",
             user_goals=goals,
-            equipment_list=[eq.value for eq in user_profile.available_equipment],
+            equipment_list=user_profile.equipment_values,
             days_per_week=user_profile.schedule_days,
             num_weeks=num_weeks,
         )
@@ -102,7 +370,7 @@ class ProgramGenerator:
         if self.verbose:
             print("=== Phase 1: Analyzing user profile and equipment ===\n")
 
-        await notify("phase", "Analyzing user profile...")
+        notify("phase", "Analyzing user profile...")
 
         # Execute Phase 1 & 2: DAG plan
         plan = build_generation_plan(context)
@@ -112,8 +380,12 @@ class ProgramGenerator:
             permission_mode=PermissionMode.DEFAULT,
         )
 
-        await notify("phase", "Assessing available equipment...")
-        plan_result = await executor.execute(plan)
+        notify("phase", "Assessing available equipment...")
+        # Set up the specialists while the plan's model calls are in flight
+        plan_result, specialist_clients = await asyncio.gather(
+            executor.execute(plan),
+            self._prepare_specialists(equipment_constraints),
+        )
 
         # Extract outputs
         user_analysis = plan_result.get("user_analysis", {})
@@ -121,10 +393,14 @@ class ProgramGenerator:
         program_framework = plan_result.get("program_framework", {})
         constraint_extraction = plan_result.get("constraint_extraction", {})
 
-        phase_outputs["user_analysis"] = user_analysis
-        phase_outputs["equipment_assessment"] = equipment_assessment
-        phase_outputs["program_framework"] = program_framework
-        phase_outputs["constraint_extraction"] = constraint_extraction
+        # All phase keys up front; "congregation" is filled in after Phase 3
+        phase_outputs: dict[str, dict] = {
+            "user_analysis": user_analysis,
+            "equipment_assessment": equipment_assessment,
+            "program_framework": program_framework,
+            "constraint_extraction": constraint_extraction,
+            "congregation": {},
+        }
 
         # Build extracted constraints list and constraint checklist for mediator
         extracted_constraints = constraint_extraction.get("constraints", [])
@@ -140,7 +416,7 @@ class ProgramGenerator:
             print(f"Days: {program_framework.get('days_per_week', 'N/A')}/week")
             print(f"Periodization: {program_framework.get('periodization', 'N/A')}")
 
-        await notify("phase", "Building program framework...", {
+        notify("phase", "Building program framework...", {
             "split": program_framework.get("split_type", "N/A"),
             "days": program_framework.get("days_per_week", "N/A"),
         })
@@ -148,164 +424,15 @@ class ProgramGenerator:
         if self.verbose:
             print("\n=== Phase 3: Multi-agent congregation ===\n")
 
-        await notify("phase", "Specialists are deliberating...")
-
-        # Map client_id to friendly name
-        specialist_names = {
-            "strength_coach": "Strength Coach",
-            "hypertrophy_expert": "Hypertrophy Expert",
-            "periodization_specialist": "Periodization Specialist",
-            "recovery_analyst": "Recovery Analyst",
-            "mediator": "Mediator",
-        }
+        notify("phase", "Specialists are deliberating...")
 
         # Execute Phase 3: Congregation with streaming if callback provided
-        if on_progress:
-            # Use streaming to emit real-time specialist events
-            congregation_result = None
-            deliberation_log = []
-            captured_mediator_output = None  # Capture from MEDIATOR_SYNTHESIS event
-
-            # Set up question callback for ask_human tool
-            async def question_callback(question_id: str, specialist: str, question: str):
-                await notify("human_question", specialist, {
-                    "question_id": question_id,
-                    "question": question,
-                })
-
-            set_question_callback(question_callback)
-
-            try:
-                async for event in run_congregation_stream(
-                    user_summary=context.user_profile,
-                    program_framework=program_framework,
-                    equipment_constraints=equipment_constraints,
-                    profile_id=user_profile.id,
-                    constraint_checklist=constraint_checklist,
-                    num_weeks=num_weeks,
-                ):
-                    if event.type == CongregationEventType.CLIENT_START:
-                        # Track which specialist is currently active
-                        persona_name = event.data.get("persona_name", "Specialist")
-                        set_current_specialist(persona_name)
-                        if self.verbose:
-                            print(f"  [{persona_name}] thinking...")
-
-                    elif event.type == CongregationEventType.CLIENT_RESPONSE:
-                        client_id = event.data.get("client_id", "")
-                        persona_name = event.data.get("persona_name", "")
-                        thoughts = event.data.get("thoughts", "")
-                        aligned = event.data.get("aligned")
-
-                        # Record for deliberation log
-                        deliberation_log.append({
-                            "client_id": client_id,
-                            "content": thoughts,
-                            "is_aligned": aligned,
-                        })
-
-                        if self.verbose:
-                            status = "aligned" if aligned else "proposing changes"
-                            preview = thoughts[:300] + "..." if len(thoughts) > 300 else thoughts
-                            print(f"  [{persona_name}] ({status})")
-                            print(f"    {preview}\n")
-
-                        # Emit specialist event with both preview and full content
-                        if thoughts:
-                            preview = thoughts[:200] + "..." if len(thoughts) > 200 else thoughts
-                            await notify("specialist", persona_name, {
-                                "preview": preview,
-                                "full": thoughts,
-                                "aligned": aligned,
-                            })
-
-                    elif event.type == CongregationEventType.TURN_START:
-                        turn = event.data.get("turn", 0)
-                        if self.verbose:
-                            print(f"\n--- Deliberation round {turn} ---\n")
-                        await notify("phase", f"Deliberation round {turn}...")
-
-                    elif event.type == CongregationEventType.CLIENT_INFO_REQUEST:
-                        persona_name = event.data.get("persona_name", "Specialist")
-                        requests = event.data.get("requests", [])
-                        if requests:
-                            func_names = [r.get("identifier", "") for r in requests if r.get("identifier")]
-                            if func_names:
-                                if self.verbose:
-                                    print(f"  [{persona_name}] querying: {', '.join(func_names)}")
-                                await notify("info_request", persona_name, {
-                                    "functions": func_names,
-                                })
-
-                    elif event.type == CongregationEventType.PEER_MESSAGE_SENT:
-                        from_id = event.data.get("from", "")
-                        from_name = specialist_names.get(from_id, from_id)
-                        messages = event.data.get("messages", [])
-                        for pm in messages:
-                            to_label = pm.get("to", "")
-                            if to_label == "all":
-                                to_label = "everyone"
-                            if self.verbose:
-                                print(f"  [{from_name}] → {to_label}: {pm.get('content', '')}")
-                            await notify("peer_message", from_name, {
-                                "to": pm.get("to", ""),
-                                "content": pm.get("content", ""),
-                            })
-
-                    elif event.type == CongregationEventType.CLIENT_INFO_RESULT:
-                        pass
-
-                    elif event.type == CongregationEventType.PEER_MESSAGE_DELIVERED:
-                        delivered = event.data.get("delivered", [])
-                        if self.verbose and delivered:
-                            print(f"  ({len(delivered)} peer message(s) delivered to inboxes)")
-
-                    elif event.type == CongregationEventType.CONVERGENCE:
-                        if self.verbose:
-                            print("  *** Convergence reached ***")
-
-                    elif event.type == CongregationEventType.MEDIATOR_START:
-                        if self.verbose:
-                            print("\n  Mediator synthesizing final program...")
-
-                    elif event.type == CongregationEventType.MEDIATOR_SYNTHESIS:
-                        await notify("phase", "Mediator synthesizing final program...")
-                        captured_mediator_output = event.data.get("output")
-                        if self.verbose:
-                            print("  Mediator synthesis complete.")
-
-                    elif event.type == CongregationEventType.COMPLETED:
-                        result = event.data.get("result")
-                        if result:
-                            if self.verbose:
-                                print(f"\n  Deliberation complete: converged={result.converged}, "
-                                      f"turns={result.turns_taken}, mediated={result.mediated}")
-
-                            raw_output = result.final_output or captured_mediator_output or {}
-
-                            # Handle case where final_output is a string (JSON) instead of dict
-                            final_program = raw_output
-                            if isinstance(final_program, str):
-                                import json
-                                try:
-                                    final_program = json.loads(final_program)
-                                except json.JSONDecodeError:
-                                    final_program = {}
-
-                            if self.verbose and isinstance(final_program, dict):
-                                weeks = final_program.get("weeks", [])
-                                print(f"  Program: {final_program.get('program_name', 'N/A')}, "
-                                      f"{len(weeks)} weeks")
-
-                            congregation_result = CongregationResult(
-                                final_program=final_program,
-                                final_thesis=result.final_thesis,
-                                deliberation_log=deliberation_log,
-                                converged=result.converged,
-                            )
-            finally:
-                # Clean up question callback
-                set_question_callback(None)
+        if streaming:
+            congregation_result = await self._stream_congregation(
+                context, program_framework, equipment_constraints,
+                user_profile.id, constraint_checklist, num_weeks,
+                notify, specialist_clients, timeout=congregation_timeout,
+            )
         else:
             # Use non-streaming version
             congregation_result = await run_congregation(
@@ -316,24 +443,9 @@ class ProgramGenerator:
                 profile_id=user_profile.id,
                 constraint_checklist=constraint_checklist,
                 num_weeks=num_weeks,
+                clients=specialist_clients,
             )
 
-            # Stream specialist contributions after the fact (for backward compat)
-            for entry in congregation_result.deliberation_log:
-                client_id = entry.get("client_id", "")
-                content = entry.get("content", "")
-                aligned = entry.get("is_aligned")
-                name = specialist_names.get(client_id, client_id)
-
-                if content and name:
-                    # Send both preview and full content
-                    preview = content[:200] + "..." if len(content) > 200 else content
-                    await notify("specialist", name, {
-                        "preview": preview,
-                        "full": content,
-                        "aligned": aligned,
-                    })
-
         # Enforce the requested program length: truncate if too long, pad by
         # cloning the last non-deload week (with re-numbering) if too short.
         self._enforce_program_length(
@@ -349,7 +461,7 @@ class ProgramGenerator:
         if self.verbose:
             print("\n=== Validating program against constraints ===\n")
 
-        await notify("phase", "Validating program constraints...")
+        notify("phase", "Validating program constraints...")
 
         for attempt in range(MAX_CORRECTION_RETRIES + 1):
             validation = validate_program_constraints(
@@ -382,7 +494,7 @@ class ProgramGenerator:
                     f"  Found {len(validation.errors)} violation(s), "
                     f"requesting correction (attempt {attempt + 1}/{MAX_CORRECTION_RETRIES})..."
                 )
-            await notify(
+            notify(
                 "phase",
                 f"Fixing {len(validation.errors)} constraint violation(s) "
                 f"(attempt {attempt + 1})...",
@@ -397,34 +509,46 @@ class ProgramGenerator:
         if self.verbose:
             print("\n=== Phase 4: Enriching exercises with form notes + videos ===\n")
 
-        await notify("phase", "Looking up form notes and demo videos...")
+        notify("phase", "Looking up form notes and demo videos...")
 
         await self._enrich_exercises(
             congregation_result.final_program,
-            on_progress=on_progress,
+            notify=notify,
         )
 
         if self.verbose:
             print("\n=== Phase 5: Generating Liftoscript ===\n")
 
-        await notify("phase", "Converting to Liftoscript...")
+        notify("phase", "Converting to Liftoscript...")
 
-        # Step 1: Build Program model (still needed for DB storage)
-        program = self._build_program(
-            congregation_result.final_program,
-            congregation_result.final_thesis,
-            goals,
-            congregation_result.deliberation_log,
-            user_profile.id,
-        )
-
-        # Step 2: AI-powered Liftoscript conversion
+        # Step 1: Build Program model (still needed for DB storage) in a worker
+        # thread while Step 2, the AI-powered Liftoscript conversion, runs on the
+        # event loop. The task group cancels the other step if either one fails.
         # Use the requested length so Liftoscript output matches what the user asked for.
-        conversion_result = await self.converter.convert(
-            final_program=congregation_result.final_program,
-            final_thesis=congregation_result.final_thesis or "",
-            num_weeks=num_weeks,
-        )
+        try:
+            async with asyncio.TaskGroup() as tg:
+                program_task = tg.create_task(
+                    asyncio.to_thread(
+                        self._build_program,
+                        congregation_result.final_program,
+                        congregation_result.final_thesis,
+                        goals,
+                        congregation_result.deliberation_log,
+                        user_profile.id,
+                    )
+                )
+                conversion_task = tg.create_task(
+                    self.converter.convert(
+                        final_program=congregation_result.final_program,
+                        final_thesis=congregation_result.final_thesis or "",
+                        num_weeks=num_weeks,
+                    )
+                )
+        except ExceptionGroup as group:
+            # Callers report str(error), so surface the failing step's own error
+            raise group.exceptions[0] from None
+        program = program_task.result()
+        conversion_result = conversion_task.result()
         liftoscript = conversion_result.liftoscript
 
         # Step 3: Fix duplicate progress conflicts (auto-add labels)
@@ -439,7 +563,7 @@ class ProgramGenerator:
         if not liftoscript.strip():
             if self.verbose:
                 print("  AI converter returned empty, falling back to Python generator")
-            liftoscript = self.generator.generate(program)
+            liftoscript = await asyncio.to_thread(self.generator.generate, program)
 
         program.liftoscript = liftoscript
 
@@ -456,6 +580,202 @@ class ProgramGenerator:
             liftoscript=liftoscript,
         )
 
+    async def _prepare_specialists(
+        self, equipment_constraints: str | None
+    ) -> list[ConversationClient]:
+        """Create the specialist clients ahead of the congregation.
+
+        Run alongside the Phase 1/2 plan so the setup happens while the
+        plan is waiting on the model.
+        """
+        return create_specialist_clients(equipment_constraints=equipment_constraints)
+
+    async def _stream_congregation(
+        self,
+        context: PlanContext,
+        program_framework: dict,
+        equipment_constraints: str | None,
+        profile_id: int | None,
+        constraint_checklist: str,
+        num_weeks: int,
+        notify: NotifyFunc,
+        specialist_clients: list[ConversationClient] | None = None,
+        timeout: float = DEFAULT_CONGREGATION_TIMEOUT_SECONDS,
+    ) -> CongregationResult | None:
+        """Run the congregation in streaming mode, emitting specialist events."""
+        state = _StreamState(notify=notify)
+        handlers = {
+            CongregationEventType.CLIENT_START: self._on_client_start,
+            CongregationEventType.CLIENT_RESPONSE: self._on_client_response,
+            CongregationEventType.TURN_START: self._on_turn_start,
+            CongregationEventType.CLIENT_INFO_REQUEST: self._on_client_info_request,
+            CongregationEventType.PEER_MESSAGE_SENT: self._on_peer_message_sent,
+            CongregationEventType.MEDIATOR_SYNTHESIS: self._on_mediator_synthesis,
+            CongregationEventType.COMPLETED: self._on_completed,
+        }
+        if self.verbose:
+            # These events only produce console output
+            handlers[CongregationEventType.PEER_MESSAGE_DELIVERED] = self._on_peer_message_delivered
+            handlers[CongregationEventType.CONVERGENCE] = self._on_convergence
+            handlers[CongregationEventType.MEDIATOR_START] = self._on_mediator_start
+
+        # Set up question callback for ask_human tool
+        async def question_callback(question_id: str, specialist: str, question: str):
+            notify("human_question", specialist, {
+                "question_id": question_id,
+                "question": question,
+            })
+
+        set_question_callback(question_callback)
+
+        events = run_congregation_stream(
+            user_summary=context.user_profile,
+            program_framework=program_framework,
+            equipment_constraints=equipment_constraints,
+            profile_id=profile_id,
+            constraint_checklist=constraint_checklist,
+            num_weeks=num_weeks,
+            clients=specialist_clients,
+        )
+        try:
+            async with asyncio.timeout(timeout), aclosing(events):
+                async for event in events:
+                    handler = handlers.get(event.type)
+                    if handler is not None:
+                        handler(event, state)
+        except TimeoutError:
+            self._on_timeout(state, timeout)
+        finally:
+            # Clean up question callback
+            set_question_callback(None)
+
+        return state.congregation_result
+
+    def _on_timeout(self, state: _StreamState, timeout: float) -> None:
+        """Fall back to whatever the mediator produced before the deadline."""
+        if state.congregation_result is not None:
+            return
+        if self.verbose:
+            print(f"\n  Deliberation timed out after {timeout:.0f}s, "
+                  "using partial result")
+        state.notify("phase", "Deliberation timed out, using partial result...")
+        state.congregation_result = CongregationResult(
+            final_program=parse_final_output(state.captured_mediator_output or {}),
+            final_thesis="",
+            deliberation_log=state.deliberation_log,
+            converged=False,
+        )
+
+    def _on_client_start(self, event: CongregationEvent, state: _StreamState) -> None:
+        # Track which specialist is currently active
+        persona_name = event.data.get("persona_name", "Specialist")
+        set_current_specialist(persona_name)
+        if self.verbose:
+            print(f"  [{persona_name}] thinking...")
+
+    def _on_client_response(self, event: CongregationEvent, state: _StreamState) -> None:
+        data = event.data
+        client_id = data.get("client_id", "")
+        persona_name = data.get("persona_name", "")
+        thoughts = data.get("thoughts", "")
+        aligned = data.get("aligned")
+
+        # Record for deliberation log
+        state.deliberation_log.append({
+            "client_id": client_id,
+            "content": thoughts,
+            "is_aligned": aligned,
+        })
+
+        if self.verbose:
+            status = "aligned" if aligned else "proposing changes"
+            preview = preview_text(thoughts, 300)
+            print(f"  [{persona_name}] ({status})")
+            print(f"    {preview}\n")
+
+        # Emit specialist event with both preview and full content
+        if thoughts:
+            state.notify("specialist", persona_name, specialist_event_data(thoughts, aligned))
+
+    def _on_turn_start(self, event: CongregationEvent, state: _StreamState) -> None:
+        turn = event.data.get("turn", 0)
+        if self.verbose:
+            print(f"\n--- Deliberation round {turn} ---\n")
+        state.notify("phase", f"Deliberation round {turn}...")
+
+    def _on_client_info_request(self, event: CongregationEvent, state: _StreamState) -> None:
+        data = event.data
+        func_names = [
+            identifier
+            for r in data.get("requests") or ()
+            if (identifier := r.get("identifier"))
+        ]
+        if func_names:
+            persona_name = data.get("persona_name", "Specialist")
+            if self.verbose:
+                print(f"  [{persona_name}] querying: {', '.join(func_names)}")
+            state.notify("info_request", persona_name, {
+                "functions": func_names,
+            })
+
+    def _on_peer_message_sent(self, event: CongregationEvent, state: _StreamState) -> None:
+        data = event.data
+        from_id = data.get("from", "")
+        from_name = _SPECIALIST_NAMES.get(from_id, from_id)
+        for pm in data.get("messages", []):
+            to = pm.get("to", "")
+            content = pm.get("content", "")
+            if self.verbose:
+                to_label = "everyone" if to == "all" else to
+                print(f"  [{from_name}] → {to_label}: {content}")
+            state.notify("peer_message", from_name, {
+                "to": to,
+                "content": content,
+            })
+
+    def _on_peer_message_delivered(self, event: CongregationEvent, state: _StreamState) -> None:
+        delivered = event.data.get("delivered", [])
+        if self.verbose and delivered:
+            print(f"  ({len(delivered)} peer message(s) delivered to inboxes)")
+
+    def _on_convergence(self, event: CongregationEvent, state: _StreamState) -> None:
+        if self.verbose:
+            print("  *** Convergence reached ***")
+
+    def _on_mediator_start(self, event: CongregationEvent, state: _StreamState) -> None:
+        if self.verbose:
+            print("\n  Mediator synthesizing final program...")
+
+    def _on_mediator_synthesis(self, event: CongregationEvent, state: _StreamState) -> None:
+        state.notify("phase", "Mediator synthesizing final program...")
+        state.captured_mediator_output = event.data.get("output")
+        if self.verbose:
+            print("  Mediator synthesis complete.")
+
+    def _on_completed(self, event: CongregationEvent, state: _StreamState) -> None:
+        result = event.data.get("result")
+        if not result:
+            return
+        if self.verbose:
+            print(f"\n  Deliberation complete: converged={result.converged}, "
+                  f"turns={result.turns_taken}, mediated={result.mediated}")
+
+        raw_output = result.final_output or state.captured_mediator_output or {}
+
+        final_program = parse_final_output(raw_output)
+
+        if self.verbose and isinstance(final_program, dict):
+            weeks = final_program.get("weeks", [])
+            print(f"  Program: {final_program.get('program_name', 'N/A')}, "
+                  f"{len(weeks)} weeks")
+
+        state.congregation_result = CongregationResult(
+            final_program=final_program,
+            final_thesis=result.final_thesis,
+            deliberation_log=state.deliberation_log,
+            converged=result.converged,
+        )
+
     def _enforce_program_length(
         self,
         program_data: dict,
@@ -469,8 +789,6 @@ class ProgramGenerator:
 
         Mutates `program_data` in place.
         """
-        import copy
-
         if not isinstance(program_data, dict):
             return
 
@@ -525,7 +843,7 @@ class ProgramGenerator:
     async def _enrich_exercises(
         self,
         program_data: dict,
-        on_progress: ProgressCallback | None = None,
+        notify: NotifyFunc = _null_notify,
     ) -> None:
         """Run a parallel DAG that fetches form notes + a YouTube demo per exercise.
 
@@ -585,10 +903,6 @@ class ProgramGenerator:
                 print(f"  Enrichment phase failed: {e}")
             return
 
-        async def notify(event_type: str, message: str, data: dict | None = None):
-            if on_progress:
-                await on_progress(event_type, message, data)
-
         for ex_name, node_name in name_map.items():
             result = plan_result.get(node_name) or {}
             if not isinstance(result, dict):
@@ -613,7 +927,7 @@ class ProgramGenerator:
                 video_label = video_url if video_url else "no video"
                 print(f"  [{ex_name}] {video_label}")
 
-            await notify("exercise_enrichment", ex_name, {
+            notify("exercise_enrichment", ex_name, {
                 "posture": posture,
                 "position": position,
                 "cues": cues,
@@ -629,8 +943,6 @@ class ProgramGenerator:
         profile_id: int | None,
     ) -> Program:
         """Convert AI output to Program model."""
-        weeks = []
-
         # Ensure program_data is a dict
         if not isinstance(program_data, dict):
             program_data = {}
@@ -642,144 +954,26 @@ class ProgramGenerator:
                 print("  Warning: No weeks in program data, using fallback")
             weeks_data = self._parse_thesis_to_weeks(final_thesis)
 
-        for week_data in weeks_data:
-            if not isinstance(week_data, dict):
-                continue
-
-            days = []
-
-            for day_data in week_data.get("days", []):
-                if not isinstance(day_data, dict):
-                    continue
-
-                exercises = []
-
-                for ex_data in day_data.get("exercises", []):
-                    if not isinstance(ex_data, dict):
-                        continue
-
-                    # Skip cardio/duration-based exercises that can't be expressed in Liftoscript
-                    if "duration_minutes" in ex_data and "reps_min" not in ex_data:
-                        continue
-
-                    # Build set schemes
-                    sets = []
-                    num_sets = ex_data.get("sets", 3)
-                    if not isinstance(num_sets, int):
-                        try:
-                            num_sets = int(num_sets)
-                        except (ValueError, TypeError):
-                            num_sets = 3
-                    reps_min = ex_data.get("reps_min", 5)
-                    if not isinstance(reps_min, int):
-                        try:
-                            reps_min = int(reps_min)
-                        except (ValueError, TypeError):
-                            reps_min = 5
-                    reps_max = ex_data.get("reps_max", reps_min)
-                    if not isinstance(reps_max, int):
-                        try:
-                            reps_max = int(reps_max)
-                        except (ValueError, TypeError):
-                            reps_max = reps_min
-                    is_amrap = ex_data.get("is_amrap_final_set", False)
-
-                    # Per-set RPE from enriched data (e.g., [9, 10])
-                    rpe_per_set = ex_data.get("rpe_per_set", [])
-                    if not isinstance(rpe_per_set, list):
-                        rpe_per_set = []
-
-                    # Rest seconds from enriched data
-                    rest_seconds = ex_data.get("rest_seconds")
-                    if rest_seconds is not None:
-                        try:
-                            rest_seconds = int(rest_seconds)
-                        except (ValueError, TypeError):
-                            rest_seconds = None
-
-                    for i in range(num_sets):
-                        is_last = i == num_sets - 1
-                        reps = reps_min if reps_min == reps_max else f"{reps_min}-{reps_max}"
-                        # Use per-set RPE if available, else fall back to uniform rpe_target
-                        set_rpe = None
-                        if rpe_per_set and i < len(rpe_per_set):
-                            try:
-                                set_rpe = float(rpe_per_set[i])
-                            except (ValueError, TypeError):
-                                set_rpe = None
-                        if set_rpe is None:
-                            set_rpe = ex_data.get("rpe_target")
-
-                        sets.append(
-                            SetScheme(
-                                reps=reps,
-                                rpe=set_rpe,
-                                is_amrap=is_last and is_amrap,
-                                rest_seconds=rest_seconds,
-                            )
-                        )
-
-                    # Map progression type
-                    prog_type = ex_data.get("progression", "dp")
-                    try:
-                        progression = ProgressionScheme(prog_type)
-                    except ValueError:
-                        progression = ProgressionScheme.DOUBLE
-
-                    # Coerce increment to a number
-                    raw_increment = ex_data.get("increment", 5)
-                    if not isinstance(raw_increment, (int, float)):
-                        try:
-                            raw_increment = float(raw_increment)
-                        except (ValueError, TypeError):
-                            raw_increment = 5
-
-                    # Collect enriched metadata
-                    substitutions = ex_data.get("substitutions", [])
-                    if not isinstance(substitutions, list):
-                        substitutions = []
-                    techniques = ex_data.get("techniques", [])
-                    if not isinstance(techniques, list):
-                        techniques = []
-
-                    cues = ex_data.get("cues", [])
-                    if not isinstance(cues, list):
-                        cues = []
-
-                    exercises.append(
-                        ProgramExercise(
-                            name=ex_data.get("name", "Unknown"),
-                            sets=sets,
-                            progression=progression,
-                            progression_params={
-                                "increment": raw_increment,
-                            },
-                            notes=ex_data.get("notes", ""),
-                            substitutions=substitutions,
-                            techniques=techniques,
-                            posture=ex_data.get("posture", "") or "",
-                            position=ex_data.get("position", "") or "",
-                            cues=[str(c) for c in cues if c],
-                            video_url=ex_data.get("video_url", "") or "",
-                        )
-                    )
-
-                days.append(
+        weeks = [
+            ProgramWeek(
+                week_number=week_data.get("week_number", week_number),
+                days=[
                     ProgramDay(
-                        name=day_data.get("name", f"Day {len(days) + 1}"),
+                        name=day_data.get("name", f"Day {day_number}"),
                         focus=day_data.get("focus", ""),
-                        exercises=exercises,
+                        exercises=[
+                            exercise
+                            for ex_data in day_data.get("exercises", [])
+                            if (exercise := _build_exercise(ex_data)) is not None
+                        ],
                     )
-                )
-
-            weeks.append(
-                ProgramWeek(
-                    week_number=week_data.get("week_number", len(weeks) + 1),
-                    days=days,
-                    deload=week_data.get("is_deload", False),
-                    phase_name=week_data.get("phase_name", ""),
-                )
+                    for day_number, day_data in enumerate(_dicts(week_data.get("days", [])), 1)
+                ],
+                deload=week_data.get("is_deload", False),
+                phase_name=week_data.get("phase_name", ""),
             )
+            for week_number, week_data in enumerate(_dicts(weeks_data), 1)
+        ]
 
         return Program(
             name=program_data.get("program_name", "Generated Program"),
@@ -801,8 +995,6 @@ class ProgramGenerator:
         Sends the program + violations to Sonnet and asks it to fix only the
         flagged issues, returning the corrected program dict.
         """
-        from .liftoscript_converter import LiftoscriptConverter
-
         violation_lines = []
         for v in violations:
             line = f"- [{v.constraint_type}] {v.message}"
@@ -812,7 +1004,7 @@ class ProgramGenerator:
                 line += f" — suggestion: {v.suggestion}"
             violation_lines.append(line)
 
-        eq_list = ", ".join(eq.value for eq in user_profile.available_equipment)
+        eq_list = ", ".join(user_profile.equipment_values)
         limitations_str = ""
         if user_profile.limitations:
             lim_lines = []
@@ -844,12 +1036,9 @@ INSTRUCTIONS:
 4. Return the complete corrected program with the same JSON structure"""
 
         try:
-            from orca import AgentChat, ModelType as OrcaModelType
-            from .output_specs import final_program_specs
-
             chat = AgentChat(
                 system_prompt="You are a program correction assistant. Fix the specified constraint violations in the training program.",
-                model_type=OrcaModelType.SONNET,
+                model_type=ModelType.SONNET,
                 output_specs=final_program_specs,
             )
 
@@ -871,29 +1060,12 @@ INSTRUCTIONS:
         # Return original if correction failed
         return program_data
 
-    def _parse_thesis_to_weeks(self, thesis: str) -> list[dict]:
+    def _parse_thesis_to_weeks(self, thesis: str) -> tuple[Mapping, ...]:
         """Attempt to parse a free-form thesis into week structure.
 
         This is a fallback when structured output parsing fails.
         """
-        # Default 4-week program structure
-        return [
-            {
-                "week_number": 1,
-                "is_deload": False,
-                "days": [
-                    {
-                        "name": "Day 1",
-                        "focus": "Full Body",
-                        "exercises": [
-                            {"name": "Squat", "sets": 3, "reps_min": 5, "reps_max": 5, "progression": "lp", "increment": 5},
-                            {"name": "Bench Press", "sets": 3, "reps_min": 5, "reps_max": 5, "progression": "lp", "increment": 5},
-                            {"name": "Barbell Row", "sets": 3, "reps_min": 5, "reps_max": 5, "progression": "lp", "increment": 5},
-                        ],
-                    },
-                ],
-            },
-        ]
+        return _DEFAULT_THESIS_WEEKS
 
 
 # Alias for backwards compatibility
@@ -1,6 +1,10 @@
 """DAG plan builder for program generation workflow."""
 
+import json
+import re
+from collections.abc import Sequence
 from dataclasses import dataclass
+from functools import lru_cache
 
 from orca import Plan, PlanNode, ModelType
 
@@ -27,11 +31,29 @@ class PlanContext:
     user_profile: str
     fitness_data: str
     user_goals: str
-    equipment_list: list[str]
+    equipment_list: Sequence[str]
     days_per_week: int
     num_weeks: int = 4
 
 
+def _escape_for_prompt(text: str) -> str:
+    """Neutralize user text that would break a prompt's structure.
+
+    Code fences would close the prompt's own fences, and {{name}} would be
+    substituted by orca as a reference to another node's output. Every pair
+    of adjacent equal braces is split, so longer runs like {{{x}}} are too.
+    """
+    return re.sub(r"([{}])(?=\1)", r"\1 ", text.replace("```", "'''"))
+
+
+@lru_cache(maxsize=64)
+def _equipment_assessment_prompt(equipment: tuple[str, ...]) -> str:
+    """Format the equipment assessment prompt, which depends only on equipment."""
+    return EQUIPMENT_ASSESSMENT_PROMPT.format(
+        equipment_list=_escape_for_prompt(", ".join(equipment))
+    )
+
+
 def build_generation_plan(context: PlanContext) -> Plan:
     """Build the DAG plan for program generation.
 
@@ -47,12 +69,15 @@ def build_generation_plan(context: PlanContext) -> Plan:
 
     Note: congregation and liftoscript generation are handled separately.
     """
+    user_profile = _escape_for_prompt(context.user_profile)
+    user_goals = _escape_for_prompt(context.user_goals)
+
     # Phase 1: Parallel analysis tasks
     user_analysis_node = PlanNode(
         name="user_analysis",
         prompt=USER_ANALYSIS_PROMPT.format(
-            user_profile=context.user_profile,
-            fitness_data=context.fitness_data,
+            user_profile=user_profile,
+            fitness_data=_escape_for_prompt(context.fitness_data),
         ),
         output_specs=user_analysis_specs,
         model_override=ModelType.SONNET,
@@ -60,9 +85,7 @@ def build_generation_plan(context: PlanContext) -> Plan:
 
     equipment_assessment_node = PlanNode(
         name="equipment_assessment",
-        prompt=EQUIPMENT_ASSESSMENT_PROMPT.format(
-            equipment_list=", ".join(context.equipment_list),
-        ),
+        prompt=_equipment_assessment_prompt(tuple(context.equipment_list)),
         output_specs=equipment_assessment_specs,
         model_override=ModelType.SONNET,
     )
@@ -70,8 +93,8 @@ def build_generation_plan(context: PlanContext) -> Plan:
     constraint_extraction_node = PlanNode(
         name="constraint_extraction",
         prompt=CONSTRAINT_EXTRACTION_PROMPT.format(
-            user_goals=context.user_goals,
-            user_profile=context.user_profile,
+            user_goals=user_goals,
+            user_profile=user_profile,
         ),
         output_specs=constraint_extraction_specs,
         model_override=ModelType.SONNET,
@@ -82,7 +105,7 @@ def build_generation_plan(context: PlanContext) -> Plan:
     framework_prompt = PROGRAM_FRAMEWORK_PROMPT.format(
         user_analysis="{{user_analysis}}",  # Will be replaced with actual output
         equipment_assessment="{{equipment_assessment}}",
-        user_goals=context.user_goals,
+        user_goals=user_goals,
         days_per_week=context.days_per_week,
         num_weeks=context.num_weeks,
     )
@@ -112,8 +135,6 @@ def build_generation_plan(context: PlanContext) -> Plan:
 
 def _enrichment_node_name(exercise_name: str) -> str:
     """Derive a stable, plan-safe node name from an exercise name."""
-    import re
-
     slug = re.sub(r"[^a-z0-9]+", "_", exercise_name.lower()).strip("_")
     return f"enrich_{slug or 'exercise'}"
 
@@ -177,18 +198,16 @@ def build_refinement_plan(
     refinement_request: str,
 ) -> Plan:
     """Build a plan for refining an existing program."""
-    import json
-
     refinement_node = PlanNode(
         name="refine_program",
         prompt=f"""Refine the following program based on the user's request:
 
 Current Program:
 ```json
-{json.dumps(program_structure, indent=2)}
+{json.dumps(program_structure, separators=(",", ":"))}
 ```
 
-User Request: {refinement_request}
+User Request: {_escape_for_prompt(refinement_request)}
 
 Provide the updated program structure as JSON with the same schema.
 Explain what was changed and why.""",
@@ -222,12 +222,11 @@ IMPORTANT: You have web access. Before finalizing the program, consult the offic
 - Proper formatting for the final program output"""
 
 # Task prompts
+#
+# Instructions come first and per-user input last, so every call to the same
+# node shares the longest possible cacheable prompt prefix.
 
-USER_ANALYSIS_PROMPT = """Analyze the following user profile and fitness data to understand their training needs:
-
-{user_profile}
-
-{fitness_data}
+USER_ANALYSIS_PROMPT = """Analyze the user profile and fitness data below to understand their training needs.
 
 Provide a comprehensive analysis including:
 1. Assessment of their training experience and current fitness level
@@ -235,38 +234,56 @@ Provide a comprehensive analysis including:
 3. Their training capacity (time, recovery ability)
 4. Baseline strength estimates if available
 5. Any limitations to consider
-6. Initial recommendations for program design"""
+6. Initial recommendations for program design
+
+---
+INPUT:
 
-EQUIPMENT_ASSESSMENT_PROMPT = """Based on the user's available equipment, assess what exercises can be included in their program:
+{user_profile}
+
+{fitness_data}"""
 
-Available Equipment: {equipment_list}
+EQUIPMENT_ASSESSMENT_PROMPT = """Based on the user's available equipment listed below, assess what exercises can be included in their program.
 
 Provide:
 1. Classification of their gym setup (full gym, home gym, minimal, bodyweight only)
 2. List of compound movements they can perform
 3. List of isolation movements they can perform
 4. Any exercise substitutions needed
-5. Exercises that cannot be performed due to equipment limitations"""
+5. Exercises that cannot be performed due to equipment limitations
 
-PROGRAM_FRAMEWORK_PROMPT = """Based on the user analysis and equipment assessment, design the high-level program structure:
+---
+INPUT:
 
-User Analysis:
-{user_analysis}
+Available Equipment: {equipment_list}"""
 
-Equipment Assessment:
-{equipment_assessment}
+PROGRAM_FRAMEWORK_PROMPT = """Based on the user analysis and equipment assessment below, design the high-level program structure.
 
-User's Request: {user_goals}
-
-HARD REQUIREMENT — Program length: EXACTLY {num_weeks} weeks. Do not propose more or fewer weeks. Your periodization, deload placement, and phase boundaries MUST fit within {num_weeks} weeks total.
+HARD REQUIREMENT — Program length: use EXACTLY the number of weeks given in the input. \
+Do not propose more or fewer weeks. Your periodization, deload placement, and phase \
+boundaries MUST fit within that many weeks total.
 
 Design:
-1. The optimal training split for their schedule ({days_per_week} days/week)
+1. The optimal training split for their schedule (days per week given in the input)
 2. The focus of each training day
 3. Primary movements for each day
-4. Periodization approach scoped to {num_weeks} weeks (e.g., where the deload lands, how many phases fit)
+4. Periodization approach scoped to the program length (e.g., where the deload lands, how many phases fit)
 5. Progression philosophy
-6. Deload strategy that fits inside {num_weeks} weeks"""
+6. Deload strategy that fits inside the program length
+
+---
+INPUT:
+
+Program length: EXACTLY {num_weeks} weeks
+Days per week: {days_per_week}
+
+User Analysis:
+{user_analysis}
+
+Equipment Assessment:
+{equipment_assessment}
+
+User's Request: {user_goals}"""
 
 SPECIALIST_RECOMMENDATION_PROMPT = """As a {specialist_role}, review the proposed program framework and provide your expert recommendations:
 
@@ -292,19 +309,22 @@ Provide your recommendations including:
 5. Any concerns about the current proposal
 6. A priority score (1-10) for how strongly you feel about your recommendations"""
 
-CONSTRAINT_EXTRACTION_PROMPT = """Analyze the following user request and profile to extract ALL explicit and implicit constraints for program design.
-
-User Request: {user_goals}
-
-User Profile:
-{user_profile}
+CONSTRAINT_EXTRACTION_PROMPT = """Analyze the user request and profile below to extract ALL explicit and implicit constraints for program design.
 
 Extract every constraint the program MUST satisfy. Be thorough — if the user says "only treadmill for cardio", that means NO elliptical, NO bike, NO rowing machine, etc.
 
 For each constraint, provide:
 1. The constraint type (equipment, schedule, exercise_restriction, exercise_requirement, cardio, other)
 2. A clear rule statement
-3. What would violate it (examples of violations)"""
+3. What would violate it (examples of violations)
+
+---
+INPUT:
+
+User Request: {user_goals}
+
+User Profile:
+{user_profile}"""
 
 
 def format_constraint_checklist(
@@ -327,7 +347,7 @@ def format_constraint_checklist(
         )
 
     # Equipment
-    eq_list = ", ".join(eq.value for eq in user_profile.available_equipment)
+    eq_list = ", ".join(user_profile.equipment_values)
     lines.append(f"[ ] EQUIPMENT: Only use exercises available with: {eq_list}")
     lines.append("    Do NOT include exercises requiring equipment not listed above.")
 
@@ -5,8 +5,14 @@ the user, their equipment, and available exercises during deliberation.
 """
 
 import asyncio
-from typing import Awaitable, Callable
-from uuid import uuid4
+import json
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from secrets import token_hex
+from typing import Any, Awaitable, Callable
 
 from orca import CongregationTool
 
@@ -16,21 +22,34 @@ from ..db.repositories import (
     FitnessDataRepository,
     UserProfileRepository,
 )
-from ..models.exercises import EquipmentType, MuscleGroup, MovementPattern
+from ..models.equipment import EquipmentConfig
+from ..models.exercises import EquipmentType, Exercise, MuscleGroup, MovementPattern
+from ..models.user_profile import UserProfile
 
 
-# Global context - set before congregation runs
-_profile_id: int | None = None
+# Per-session context - set before congregation runs. Context variables keep
+# concurrent generations (e.g. two web requests) from seeing each other's state.
+_profile_id: ContextVar[int | None] = ContextVar("profile_id", default=None)
 
-# Human interaction state
+# Lookups shared by every tool call in one session. The profile ID is fixed
+# for the session, so the profile, equipment config, and exercise list are
+# loaded at most once no matter how many specialists ask for them.
+_session_cache: ContextVar[dict[str, Any] | None] = ContextVar("session_cache", default=None)
+
+# Human interaction state. Pending questions stay global: answers arrive
+# through a separate web request, outside the asking session's context.
 _pending_questions: dict[str, asyncio.Future] = {}
-_question_callback: Callable[[str, str, str], Awaitable[None]] | None = None
+MAX_PENDING_QUESTIONS = 32
+_question_callback: ContextVar[Callable[[str, str, str], Awaitable[None]] | None] = ContextVar(
+    "question_callback", default=None
+)
 
 
 def set_profile_context(profile_id: int) -> None:
     """Set the profile ID for the current congregation session."""
-    global _profile_id
-    _profile_id = profile_id
+    _profile_id.set(profile_id)
+    _session_cache.set({})
+    _current_specialist.set(_Specialist())
 
 
 def set_question_callback(callback: Callable[[str, str, str], Awaitable[None]] | None) -> None:
@@ -38,8 +57,7 @@ def set_question_callback(callback: Callable[[str, str, str], Awaitable[None]] |
 
     The callback receives (question_id, specialist_name, question_text).
     """
-    global _question_callback
-    _question_callback = callback
+    _question_callback.set(callback)
 
 
 def answer_question(question_id: str, answer: str) -> bool:
@@ -60,17 +78,47 @@ def get_pending_questions() -> list[str]:
     return list(_pending_questions.keys())
 
 
+async def _cached(key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+    """Return the session's cached value for key, loading it on first use."""
+    cache = _session_cache.get()
+    if cache is None:
+        return await load()
+    if key not in cache:
+        cache[key] = await load()
+    return cache[key]
+
+
+async def _load_profile(profile_id: int) -> UserProfile | None:
+    """Load the session's user profile."""
+    return await _cached("profile", lambda: UserProfileRepository().get(profile_id))
+
+
+async def _load_equipment_config(profile_id: int) -> EquipmentConfig | None:
+    """Load the session's equipment configuration."""
+    return await _cached(
+        "equipment_config", lambda: EquipmentConfigRepository().get_by_profile(profile_id)
+    )
+
+
+async def _load_available_exercises(profile: UserProfile) -> list[Exercise]:
+    """Load the exercises the session's user can perform with their equipment."""
+    return await _cached(
+        "available_exercises",
+        lambda: ExerciseRepository().get_by_equipment(profile.available_equipment),
+    )
+
+
 async def get_user_profile() -> dict:
     """Get the full user profile including goals, experience level, and limitations.
 
     Returns a dictionary with all profile information that specialists
     can use to tailor their exercise recommendations.
     """
-    if _profile_id is None:
+    profile_id = _profile_id.get()
+    if profile_id is None:
         return {"error": "No profile context set"}
 
-    repo = UserProfileRepository()
-    profile = await repo.get(_profile_id)
+    profile = await _load_profile(profile_id)
 
     if not profile:
         return {"error": "Profile not found"}
@@ -99,11 +147,11 @@ async def get_strength_levels() -> dict:
     Returns estimated or recorded strength levels that can inform
     exercise selection and progression recommendations.
     """
-    if _profile_id is None:
+    profile_id = _profile_id.get()
+    if profile_id is None:
         return {"error": "No profile context set"}
 
-    repo = UserProfileRepository()
-    profile = await repo.get(_profile_id)
+    profile = await _load_profile(profile_id)
 
     if not profile:
         return {"error": "Profile not found"}
@@ -125,22 +173,21 @@ async def get_available_equipment() -> dict:
     Returns equipment types available and optional plate inventory
     for weight rounding calculations.
     """
-    if _profile_id is None:
+    profile_id = _profile_id.get()
+    if profile_id is None:
         return {"error": "No profile context set"}
 
-    profile_repo = UserProfileRepository()
-    profile = await profile_repo.get(_profile_id)
+    profile = await _load_profile(profile_id)
 
     if not profile:
         return {"error": "Profile not found"}
 
     result = {
-        "equipment_types": [eq.value for eq in profile.available_equipment],
+        "equipment_types": list(profile.equipment_values),
     }
 
     # Get equipment config if it exists
-    config_repo = EquipmentConfigRepository()
-    config = await config_repo.get_by_profile(_profile_id)
+    config = await _load_equipment_config(profile_id)
 
     if config:
         result["weight_unit"] = config.weight_unit
@@ -159,17 +206,16 @@ async def get_available_exercises() -> dict:
     Returns a list of exercise names that can be performed with
     the user's available equipment.
     """
-    if _profile_id is None:
+    profile_id = _profile_id.get()
+    if profile_id is None:
         return {"error": "No profile context set"}
 
-    profile_repo = UserProfileRepository()
-    profile = await profile_repo.get(_profile_id)
+    profile = await _load_profile(profile_id)
 
     if not profile:
         return {"error": "Profile not found"}
 
-    exercise_repo = ExerciseRepository()
-    exercises = await exercise_repo.get_by_equipment(profile.available_equipment)
+    exercises = await _load_available_exercises(profile)
 
     return {
         "count": len(exercises),
@@ -193,6 +239,11 @@ async def get_exercise_details(name: str) -> dict:
     Returns information about muscle groups, equipment options,
     and movement pattern.
     """
+    return await _cached(f"exercise_details:{name}", lambda: _exercise_details(name))
+
+
+async def _exercise_details(name: str) -> dict:
+    """Look up an exercise by exact name, falling back to the first search hit."""
     repo = ExerciseRepository()
     exercise = await repo.get_by_name(name)
 
@@ -207,8 +258,8 @@ async def get_exercise_details(name: str) -> dict:
     return {
         "name": exercise.name,
         "aliases": exercise.aliases,
-        "muscle_groups": [mg.value for mg in exercise.muscle_groups],
-        "equipment": [eq.value for eq in exercise.equipment],
+        "muscle_groups": list(exercise.muscle_group_values),
+        "equipment": list(exercise.equipment_values),
         "movement_pattern": exercise.movement_pattern.value,
         "is_compound": exercise.is_compound,
     }
@@ -222,6 +273,11 @@ async def search_exercises(query: str) -> dict:
 
     Returns matching exercises with their details.
     """
+    return await _cached(f"search_exercises:{query}", lambda: _search_exercises(query))
+
+
+async def _search_exercises(query: str) -> dict:
+    """Search the exercise library, returning at most 10 matches."""
     repo = ExerciseRepository()
     exercises = await repo.search(query)
 
@@ -230,7 +286,7 @@ async def search_exercises(query: str) -> dict:
         "exercises": [
             {
                 "name": ex.name,
-                "muscle_groups": [mg.value for mg in ex.muscle_groups],
+                "muscle_groups": list(ex.muscle_group_values),
                 "movement_pattern": ex.movement_pattern.value,
             }
             for ex in exercises[:10]  # Limit to 10 results
@@ -253,23 +309,17 @@ async def get_exercises_by_muscle_group(muscle_group: str) -> dict:
         valid = [m.value for m in MuscleGroup]
         return {"error": f"Invalid muscle group. Valid options: {valid}"}
 
-    if _profile_id is None:
+    profile_id = _profile_id.get()
+    if profile_id is None:
         return {"error": "No profile context set"}
 
-    profile_repo = UserProfileRepository()
-    profile = await profile_repo.get(_profile_id)
+    profile = await _load_profile(profile_id)
 
     if not profile:
         return {"error": "Profile not found"}
 
     exercise_repo = ExerciseRepository()
-    all_exercises = await exercise_repo.get_by_muscle_group(mg)
-
-    # Filter by user's equipment
-    exercises = [
-        ex for ex in all_exercises
-        if any(eq in profile.available_equipment for eq in ex.equipment)
-    ]
+    exercises = await exercise_repo.get_by_muscle_group(mg, profile.available_equipment)
 
     return {
         "muscle_group": muscle_group,
@@ -277,7 +327,7 @@ async def get_exercises_by_muscle_group(muscle_group: str) -> dict:
         "exercises": [
             {
                 "name": ex.name,
-                "equipment": [eq.value for eq in ex.equipment],
+                "equipment": list(ex.equipment_values),
                 "is_compound": ex.is_compound,
             }
             for ex in exercises
@@ -291,30 +341,24 @@ async def get_compound_exercises() -> dict:
     Compound exercises work multiple muscle groups and are typically
     prioritized in strength-focused programs.
     """
-    if _profile_id is None:
+    profile_id = _profile_id.get()
+    if profile_id is None:
         return {"error": "No profile context set"}
 
-    profile_repo = UserProfileRepository()
-    profile = await profile_repo.get(_profile_id)
+    profile = await _load_profile(profile_id)
 
     if not profile:
         return {"error": "Profile not found"}
 
     exercise_repo = ExerciseRepository()
-    all_compound = await exercise_repo.get_compound_exercises()
-
-    # Filter by user's equipment
-    exercises = [
-        ex for ex in all_compound
-        if any(eq in profile.available_equipment for eq in ex.equipment)
-    ]
+    exercises = await exercise_repo.get_compound_exercises(profile.available_equipment)
 
     return {
         "count": len(exercises),
         "exercises": [
             {
                 "name": ex.name,
-                "muscle_groups": [mg.value for mg in ex.muscle_groups],
+                "muscle_groups": list(ex.muscle_group_values),
                 "movement_pattern": ex.movement_pattern.value,
             }
             for ex in exercises
@@ -322,14 +366,27 @@ async def get_compound_exercises() -> dict:
     }
 
 
-# Track which specialist is currently active (set by executor)
-_current_specialist: str = "Specialist"
+@dataclass(slots=True)
+class _Specialist:
+    """The session's currently active specialist (set by executor)."""
+
+    name: str = "Specialist"
+
+
+# Specialist tasks may start before the CLIENT_START event that names them,
+# so their context copies share this holder and see in-place updates
+_current_specialist: ContextVar[_Specialist | None] = ContextVar(
+    "current_specialist", default=None
+)
 
 
 def set_current_specialist(name: str) -> None:
     """Set the name of the currently active specialist."""
-    global _current_specialist
-    _current_specialist = name
+    specialist = _current_specialist.get()
+    if specialist is None:
+        _current_specialist.set(_Specialist(name))
+    else:
+        specialist.name = name
 
 
 async def ask_human(question: str) -> dict:
@@ -357,25 +414,32 @@ async def ask_human(question: str) -> dict:
         - "What are your current 1RM values?" (use get_strength_levels)
         - "What weight do you use for bench press?" (progression handles this)
     """
-    global _question_callback, _current_specialist
-
-    if _question_callback is None:
+    question_callback = _question_callback.get()
+    if question_callback is None:
         return {
             "error": "Human interaction not available in this context",
             "answer": None,
         }
 
-    # Create a unique ID for this question
-    question_id = str(uuid4())[:8]
+    if len(_pending_questions) >= MAX_PENDING_QUESTIONS:
+        return {
+            "error": "Too many questions awaiting an answer",
+            "answer": None,
+        }
 
-    # Create a future to wait for the answer
-    loop = asyncio.get_event_loop()
-    future: asyncio.Future = loop.create_future()
+    # Create a unique, unguessable ID for this question (answers arrive by ID)
+    question_id = token_hex(4)
+
+    # Create a future to wait for the answer; it unregisters itself once
+    # answered, timed out, or cancelled
+    future: asyncio.Future = asyncio.get_running_loop().create_future()
     _pending_questions[question_id] = future
+    future.add_done_callback(lambda _: _pending_questions.pop(question_id, None))
 
     try:
         # Send the question to the frontend
-        await _question_callback(question_id, _current_specialist, question)
+        specialist = _current_specialist.get() or _Specialist()
+        await question_callback(question_id, specialist.name, question)
 
         # Wait for the answer (with timeout)
         answer = await asyncio.wait_for(future, timeout=300.0)  # 5 minute timeout
@@ -385,17 +449,18 @@ async def ask_human(question: str) -> dict:
             "answer": answer,
         }
     except asyncio.TimeoutError:
-        _pending_questions.pop(question_id, None)
         return {
             "error": "User did not respond in time",
             "answer": None,
         }
     except Exception as e:
-        _pending_questions.pop(question_id, None)
         return {
             "error": str(e),
             "answer": None,
         }
+    finally:
+        # Unregisters the question if it is still waiting (no-op once done)
+        future.cancel()
 
 
 async def get_fitness_history() -> dict:
@@ -404,15 +469,18 @@ async def get_fitness_history() -> dict:
     Returns workout history, exercise records, and any tracked metrics
     that can help inform program design.
     """
-    if _profile_id is None:
+    profile_id = _profile_id.get()
+    if profile_id is None:
         return {"error": "No profile context set"}
 
     repo = FitnessDataRepository()
 
-    # Get all fitness data for this profile
-    workout_data = await repo.get_by_type("workout", _profile_id)
-    exercise_data = await repo.get_by_type("exercise", _profile_id)
-    weight_data = await repo.get_by_type("weight", _profile_id)
+    # Get all fitness data for this profile; the queries are independent
+    workout_data, exercise_data, weight_data = await asyncio.gather(
+        repo.get_by_type("workout", profile_id),
+        repo.get_by_type("exercise", profile_id),
+        repo.get_by_type("weight", profile_id),
+    )
 
     # Summarize the data
     summary = {
@@ -433,51 +501,65 @@ async def get_fitness_history() -> dict:
     # Add summary stats if we have data
     if exercise_data:
         # Count exercise frequency
-        exercise_counts: dict[str, int] = {}
-        for record in exercise_data:
-            name = record.get("data", {}).get("exercise_name", "Unknown")
-            exercise_counts[name] = exercise_counts.get(name, 0) + 1
-
-        summary["most_frequent_exercises"] = sorted(
-            exercise_counts.items(), key=lambda x: -x[1]
-        )[:10]
+        exercise_counts = Counter(
+            record.get("data", {}).get("exercise_name", "Unknown") for record in exercise_data
+        )
+        summary["most_frequent_exercises"] = exercise_counts.most_common(10)
 
     return summary
 
 
+# Written by scripts/sync_liftosaur_exercises.py
+LIFTOSAUR_EXERCISES_FILE = (
+    Path(__file__).parent.parent.parent.parent / "scripts" / "liftosaur_exercises.json"
+)
+
+
+@lru_cache(maxsize=1)
+def _load_liftosaur_exercises(mtime_ns: int) -> tuple[int, tuple[str, ...], tuple[str, ...]]:
+    """Parse the sync file once per modification time.
+
+    Returns (total exercise count, valid names, equipment types).
+    """
+    with open(LIFTOSAUR_EXERCISES_FILE) as f:
+        data = json.load(f)
+    return (
+        len(data.get("exercises", [])),
+        tuple(data.get("valid_names", [])),
+        tuple(data.get("equipment_mapping", {}).values()),
+    )
+
+
 async def get_valid_exercise_names() -> dict:
     """Get the list of valid Liftosaur exercise names.
 
     Returns all exercise names that are valid in Liftosaur format.
     Use these exact names when recommending exercises.
     """
-    import json
-    from pathlib import Path
-
     # Try to load from the sync file
-    sync_file = Path(__file__).parent.parent.parent.parent / "scripts" / "liftosaur_exercises.json"
-
-    if sync_file.exists():
-        with open(sync_file) as f:
-            data = json.load(f)
-            return {
-                "total_exercises": len(data.get("exercises", [])),
-                "valid_names": data.get("valid_names", []),
-                "equipment_types": list(data.get("equipment_mapping", {}).values()),
-            }
+    try:
+        mtime_ns = LIFTOSAUR_EXERCISES_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        pass
+    else:
+        total, valid_names, equipment_types = _load_liftosaur_exercises(mtime_ns)
+        return {
+            "total_exercises": total,
+            "valid_names": list(valid_names),
+            "equipment_types": list(equipment_types),
+        }
 
     # Fallback to our exercise repository
-    if _profile_id is None:
+    profile_id = _profile_id.get()
+    if profile_id is None:
         return {"error": "No profile context set"}
 
-    profile_repo = UserProfileRepository()
-    profile = await profile_repo.get(_profile_id)
+    profile = await _load_profile(profile_id)
 
     if not profile:
         return {"error": "Profile not found"}
 
-    exercise_repo = ExerciseRepository()
-    exercises = await exercise_repo.get_by_equipment(profile.available_equipment)
+    exercises = await _load_available_exercises(profile)
 
     return {
         "total_exercises": len(exercises),
@@ -486,6 +568,45 @@ async def get_valid_exercise_names() -> dict:
     }
 
 
+# Tools without arguments that gather_context can run together
+_CONTEXT_TOOLS = {
+    tool.__name__: tool
+    for tool in (
+        get_user_profile,
+        get_strength_levels,
+        get_available_equipment,
+        get_available_exercises,
+        get_compound_exercises,
+        get_fitness_history,
+        get_valid_exercise_names,
+    )
+}
+
+
+async def gather_context(tool_names: list[str]) -> dict:
+    """Run several context tools at once and return all of their results.
+
+    Args:
+        tool_names: Names of the tools to run, any of: get_user_profile,
+            get_strength_levels, get_available_equipment, get_available_exercises,
+            get_compound_exercises, get_fitness_history, get_valid_exercise_names
+
+    Returns a dict mapping each tool name to that tool's result.
+    """
+    names = list(dict.fromkeys(tool_names))
+    unknown = [name for name in names if name not in _CONTEXT_TOOLS]
+    if unknown:
+        return {"error": f"Unknown tools: {unknown}. Valid options: {list(_CONTEXT_TOOLS)}"}
+
+    # Most tools start from the profile; load it once before fanning out
+    profile_id = _profile_id.get()
+    if profile_id is not None:
+        await _load_profile(profile_id)
+
+    results = await asyncio.gather(*(_CONTEXT_TOOLS[name]() for name in names))
+    return dict(zip(names, results))
+
+
 # Define congregation tools for export
 CONGREGATION_TOOLS = [
     CongregationTool(
@@ -537,6 +658,12 @@ CONGREGATION_TOOLS = [
         "Get the list of valid Liftosaur exercise names. IMPORTANT: Use these "
         "exact names when recommending exercises to ensure compatibility.",
     ),
+    CongregationTool(
+        gather_context,
+        "Run several of the no-argument tools above in one request, e.g. "
+        "get_user_profile together with get_available_equipment. Returns each "
+        "tool's result keyed by tool name.",
+    ),
     CongregationTool(
         ask_human,
         "Ask the user a question when you need clarification about their "
@@ -1,12 +1,15 @@
 """Base protocol for fitness data clients."""
 
+import heapq
 from abc import ABC, abstractmethod
+from collections import Counter, defaultdict
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
+from operator import attrgetter
 from typing import Protocol, runtime_checkable
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkoutSession:
     """Represents a workout session."""
 
@@ -18,7 +21,7 @@ class WorkoutSession:
     source: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class ExerciseRecord:
     """Represents a recorded exercise within a workout."""
 
@@ -27,7 +30,7 @@ class ExerciseRecord:
     segment_type: str | None = None  # Original segment type from source
 
 
-@dataclass
+@dataclass(slots=True)
 class SetRecord:
     """Represents a single set of an exercise."""
 
@@ -37,7 +40,7 @@ class SetRecord:
     rpe: float | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class BodyMetric:
     """Represents a body measurement."""
 
@@ -47,7 +50,7 @@ class BodyMetric:
     recorded_at: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class SleepRecord:
     """Represents a sleep session."""
 
@@ -57,7 +60,7 @@ class SleepRecord:
     quality_score: float | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class FitnessData:
     """Aggregated fitness data from a source."""
 
@@ -117,32 +120,24 @@ class BaseFitnessClient(ABC):
             lines.append(f"\nWorkouts: {len(data.workouts)} sessions")
 
             # Group by exercise
-            exercise_counts: dict[str, int] = {}
-            exercise_volume: dict[str, int] = {}  # total sets
+            exercise_counts: Counter[str] = Counter()
+            exercise_volume: defaultdict[str, int] = defaultdict(int)  # total sets
 
             for workout in data.workouts:
                 for exercise in workout.exercises:
-                    name = exercise.name
-                    exercise_counts[name] = exercise_counts.get(name, 0) + 1
-                    exercise_volume[name] = exercise_volume.get(name, 0) + len(
-                        exercise.sets
-                    )
+                    exercise_counts[exercise.name] += 1
+                    exercise_volume[exercise.name] += len(exercise.sets)
 
             if exercise_counts:
                 lines.append("\nMost frequent exercises:")
-                sorted_exercises = sorted(
-                    exercise_counts.items(), key=lambda x: x[1], reverse=True
-                )[:10]
-                for name, count in sorted_exercises:
-                    sets = exercise_volume.get(name, 0)
+                for name, count in exercise_counts.most_common(10):
+                    sets = exercise_volume[name]
                     lines.append(f"  - {name}: {count} sessions, {sets} total sets")
 
             # Recent workouts
             if len(data.workouts) > 0:
                 lines.append("\nRecent workouts:")
-                recent = sorted(data.workouts, key=lambda w: w.start_time, reverse=True)[
-                    :5
-                ]
+                recent = heapq.nlargest(5, data.workouts, key=attrgetter("start_time"))
                 for workout in recent:
                     date = workout.start_time.strftime("%Y-%m-%d")
                     exercises = ", ".join(e.name for e in workout.exercises[:3])
@@ -157,10 +152,8 @@ class BaseFitnessClient(ABC):
             # Latest of each type
             latest_by_type: dict[str, BodyMetric] = {}
             for metric in data.body_metrics:
-                if (
-                    metric.metric_type not in latest_by_type
-                    or metric.recorded_at > latest_by_type[metric.metric_type].recorded_at
-                ):
+                latest = latest_by_type.get(metric.metric_type)
+                if latest is None or metric.recorded_at > latest.recorded_at:
                     latest_by_type[metric.metric_type] = metric
 
             for metric_type, metric in latest_by_type.items():
@@ -175,10 +168,9 @@ class BaseFitnessClient(ABC):
 
             # Calculate averages
             total_sleep = sum(
-                (r.end_time - r.start_time).total_seconds() / 3600
-                for r in data.sleep_records
+                (r.end_time - r.start_time for r in data.sleep_records), timedelta()
             )
-            avg_sleep = total_sleep / len(data.sleep_records)
+            avg_sleep = total_sleep / len(data.sleep_records) / timedelta(hours=1)
             lines.append(f"  - Average sleep: {avg_sleep:.1f} hours")
 
         return "\n".join(lines)
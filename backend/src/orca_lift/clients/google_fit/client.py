@@ -1,11 +1,24 @@
 """Google Fit Takeout client (legacy fallback)."""
 
+import asyncio
 import csv
+import io
 import json
+import os
+import threading
 import zipfile
+from collections import deque
+from collections.abc import Callable, Iterator
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 
+# orjson is optional; its JSONDecodeError subclasses json.JSONDecodeError
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 from ..base import (
     BaseFitnessClient,
     BodyMetric,
@@ -16,11 +29,121 @@ from ..base import (
     WorkoutSession,
 )
 from .parsers import (
-    parse_daily_activity_metrics,
+    _parse_timestamp,
     parse_fit_sessions,
     parse_workout_data,
 )
 
+# Directory levels below the given path searched for the Fit folder, enough for
+# e.g. Downloads/takeout-20240115/Takeout/Fit
+FIT_SEARCH_DEPTH = 4
+
+
+def _find_fit_dir(root: Path) -> Path | None:
+    """Breadth-first search for a Fit folder at most FIT_SEARCH_DEPTH levels down."""
+    queue = deque([(root, 1)])
+    while queue:
+        path, depth = queue.popleft()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.name == "Fit" and entry.is_dir():
+                        return Path(entry.path)
+                    if depth < FIT_SEARCH_DEPTH and entry.is_dir(follow_symlinks=False):
+                        queue.append((entry.path, depth + 1))
+        except OSError:
+            continue
+    return None
+
+
+# Workouts, body metrics and sleep records parsed from one Takeout file
+_ParsedFile = tuple[list[WorkoutSession], list[BodyMetric], list[SleepRecord]]
+
+
+async def _parse_in_threads(
+    parse_one: Callable[..., _ParsedFile], items: list
+) -> list[_ParsedFile]:
+    """Run parse_one over items in worker threads, one per CPU at a time.
+
+    Results come back in item order. Every call finishes before an error is
+    raised, so a ZIP file the calls read from can be closed afterwards.
+    """
+    limit = asyncio.Semaphore(os.cpu_count() or 1)
+
+    async def run(item) -> _ParsedFile:
+        async with limit:
+            return await asyncio.to_thread(parse_one, item)
+
+    results = await asyncio.gather(*(run(item) for item in items), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+class _ZipHandles:
+    """One ZipFile per worker thread, as a ZipFile is not safe to share.
+
+    ZipFile.open and the close of an entry update the archive's file reference
+    count without a lock, so threads reading through one ZipFile can close it
+    under each other.
+    """
+
+    def __init__(self, zip_path: Path):
+        self._zip_path = zip_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._opened: list[zipfile.ZipFile] = []
+
+    def get(self) -> zipfile.ZipFile:
+        """The calling thread's ZipFile, opened on first use."""
+        zf = getattr(self._local, "zf", None)
+        if zf is None:
+            zf = self._local.zf = zipfile.ZipFile(self._zip_path)
+            with self._lock:
+                self._opened.append(zf)
+        return zf
+
+    def close(self) -> None:
+        for zf in self._opened:
+            zf.close()
+
+
+def _list_fit_entries(zip_path: Path) -> list[str]:
+    """Names of the files in the Fit folder of a Takeout ZIP file."""
+    with zipfile.ZipFile(zip_path) as zf:
+        return [
+            name
+            for name in zf.namelist()
+            if ("Fit/" in name or "fit/" in name.lower()) and not name.endswith("/")
+        ]
+
+
+def _column_indices(header: list[str], names: tuple[str, ...]) -> tuple[int, ...]:
+    """Indices of the named columns present in a CSV header, in name order.
+
+    A repeated column name resolves to its last occurrence, as with DictReader.
+    """
+    positions = {name: i for i, name in enumerate(header)}
+    return tuple(positions[name] for name in names if name in positions)
+
+
+def _match_handler(file_name: str, handlers: tuple) -> Callable | None:
+    """Handler of the first entry with a substring in the file name, if any."""
+    for substrings, handler in handlers:
+        for substring in substrings:
+            if substring in file_name:
+                return handler
+    return None
+
+
+def _first_value(row: list[str], indices: tuple[int, ...]) -> str | None:
+    """First non-empty value among the given columns of a CSV row."""
+    for i in indices:
+        if i < len(row) and row[i]:
+            return row[i]
+    return None
+
 
 class GoogleFitClient(BaseFitnessClient):
     """Client for parsing Google Fit Takeout data."""
@@ -53,78 +176,28 @@ class GoogleFitClient(BaseFitnessClient):
 
     async def _parse_zip(self, zip_path: Path) -> FitnessData:
         """Parse Google Fit data from a Takeout ZIP file."""
-        workouts: list[WorkoutSession] = []
-        body_metrics: list[BodyMetric] = []
-        sleep_records: list[SleepRecord] = []
-        raw_data: dict = {"files_processed": []}
-
-        with zipfile.ZipFile(zip_path, "r") as zf:
-            # Find Fit folder
-            fit_files = [
-                name
-                for name in zf.namelist()
-                if "Fit/" in name or "fit/" in name.lower()
-            ]
-
-            for file_path in fit_files:
-                if file_path.endswith("/"):
-                    continue
+        # Reading the central directory of a large archive blocks too
+        raw_data: dict = {"files_processed": await asyncio.to_thread(_list_fit_entries, zip_path)}
 
-                raw_data["files_processed"].append(file_path)
+        zip_handles = _ZipHandles(zip_path)
+        try:
+            results = await _parse_in_threads(
+                partial(self._parse_zip_entry, zip_handles), raw_data["files_processed"]
+            )
+        finally:
+            zip_handles.close()
 
-                try:
-                    with zf.open(file_path) as f:
-                        content = f.read()
-
-                        if file_path.endswith(".json"):
-                            data = json.loads(content.decode("utf-8"))
-                            self._process_json_file(
-                                file_path,
-                                data,
-                                workouts,
-                                body_metrics,
-                                sleep_records,
-                            )
-
-                        elif file_path.endswith(".csv"):
-                            lines = content.decode("utf-8").splitlines()
-                            reader = csv.DictReader(lines)
-                            rows = list(reader)
-                            self._process_csv_file(
-                                file_path,
-                                rows,
-                                workouts,
-                                body_metrics,
-                            )
-
-                except (json.JSONDecodeError, UnicodeDecodeError):
-                    continue
-
-        return FitnessData(
-            source=self.source_name,
-            workouts=workouts,
-            body_metrics=body_metrics,
-            sleep_records=sleep_records,
-            raw_data=raw_data,
-        )
+        return self._merge_results(results, raw_data)
 
     async def _parse_directory(self, dir_path: Path) -> FitnessData:
         """Parse Google Fit data from an extracted Takeout directory."""
-        workouts: list[WorkoutSession] = []
-        body_metrics: list[BodyMetric] = []
-        sleep_records: list[SleepRecord] = []
-        raw_data: dict = {"files_processed": []}
-
         # Find Fit folder
         fit_dir = dir_path / "Takeout" / "Fit"
         if not fit_dir.exists():
             fit_dir = dir_path / "Fit"
         if not fit_dir.exists():
-            # Try to find it recursively
-            for subdir in dir_path.rglob("Fit"):
-                if subdir.is_dir():
-                    fit_dir = subdir
-                    break
+            # Try to find it further down
+            fit_dir = _find_fit_dir(dir_path) or fit_dir
 
         if not fit_dir.exists():
             raise ValueError(
@@ -133,37 +206,109 @@ class GoogleFitClient(BaseFitnessClient):
             )
 
         # Process all JSON and CSV files
-        for file_path in fit_dir.rglob("*"):
-            if file_path.is_dir():
-                continue
-
-            raw_data["files_processed"].append(str(file_path))
-
-            try:
-                if file_path.suffix == ".json":
-                    with open(file_path) as f:
-                        data = json.load(f)
-                        self._process_json_file(
-                            str(file_path),
-                            data,
-                            workouts,
-                            body_metrics,
-                            sleep_records,
-                        )
+        files = [
+            Path(dirpath, name)
+            for dirpath, _, file_names in os.walk(fit_dir)
+            for name in file_names
+        ]
+        raw_data: dict = {"files_processed": [str(file_path) for file_path in files]}
 
-                elif file_path.suffix == ".csv":
-                    with open(file_path, newline="") as f:
-                        reader = csv.DictReader(f)
-                        rows = list(reader)
-                        self._process_csv_file(
-                            str(file_path),
-                            rows,
-                            workouts,
-                            body_metrics,
-                        )
+        results = await _parse_in_threads(self._parse_file, files)
 
-            except (json.JSONDecodeError, UnicodeDecodeError):
-                continue
+        return self._merge_results(results, raw_data)
+
+    def _parse_zip_entry(self, zip_handles: _ZipHandles, file_path: str) -> _ParsedFile:
+        """Parse one JSON or CSV entry of a Takeout ZIP file."""
+        workouts: list[WorkoutSession] = []
+        body_metrics: list[BodyMetric] = []
+        sleep_records: list[SleepRecord] = []
+        file_name = os.path.basename(file_path).lower()
+
+        try:
+            if file_path.endswith(".json"):
+                # Both loaders take the raw bytes; no str copy
+                data = _json_loads(zip_handles.get().read(file_path))
+                self._process_json_file(
+                    file_name,
+                    data,
+                    workouts,
+                    body_metrics,
+                    sleep_records,
+                )
+
+            elif file_path.endswith(".csv"):
+                with zip_handles.get().open(file_path) as f:
+                    # Decompressed and decoded as the reader goes
+                    text = io.TextIOWrapper(f, encoding="utf-8", newline="")
+                    self._process_csv_file(
+                        file_name,
+                        csv.reader(text),
+                        workouts,
+                        body_metrics,
+                    )
+
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            pass
+
+        return workouts, body_metrics, sleep_records
+
+    def _parse_file(self, file_path: Path) -> _ParsedFile:
+        """Parse one JSON or CSV file of an extracted Takeout directory."""
+        workouts: list[WorkoutSession] = []
+        body_metrics: list[BodyMetric] = []
+        sleep_records: list[SleepRecord] = []
+        file_name = file_path.name.lower()
+
+        try:
+            if file_path.suffix == ".json":
+                data = _json_loads(file_path.read_bytes())
+                self._process_json_file(
+                    file_name,
+                    data,
+                    workouts,
+                    body_metrics,
+                    sleep_records,
+                )
+
+            elif file_path.suffix == ".csv":
+                with open(file_path, newline="") as f:
+                    self._process_csv_file(
+                        file_name,
+                        csv.reader(f),
+                        workouts,
+                        body_metrics,
+                    )
+
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            pass
+
+        return workouts, body_metrics, sleep_records
+
+    def _merge_results(self, results: list[_ParsedFile], raw_data: dict) -> FitnessData:
+        """Combine per-file results, in file order, into one FitnessData.
+
+        Takeout can repeat a session across files, so a workout is dropped
+        when an earlier file already had one with the same start time, type
+        and exercises. Workouts within a single file are all kept.
+        """
+        workouts: list[WorkoutSession] = []
+        body_metrics: list[BodyMetric] = []
+        sleep_records: list[SleepRecord] = []
+        seen: set[tuple[datetime, str, tuple[str, ...]]] = set()
+        for file_workouts, file_body_metrics, file_sleep_records in results:
+            file_seen = set()
+            for workout in file_workouts:
+                key = (
+                    workout.start_time,
+                    workout.session_type,
+                    tuple(exercise.name for exercise in workout.exercises),
+                )
+                if key not in seen:
+                    file_seen.add(key)
+                    workouts.append(workout)
+            seen |= file_seen
+            body_metrics.extend(file_body_metrics)
+            sleep_records.extend(file_sleep_records)
 
         return FitnessData(
             source=self.source_name,
@@ -175,173 +320,194 @@ class GoogleFitClient(BaseFitnessClient):
 
     def _process_json_file(
         self,
-        file_path: str,
+        file_name: str,
         data: dict | list,
         workouts: list[WorkoutSession],
         body_metrics: list[BodyMetric],
         sleep_records: list[SleepRecord],
     ) -> None:
-        """Process a JSON file from Google Fit Takeout."""
-        file_name = Path(file_path).name.lower()
-
-        # Activity/workout sessions
-        if "sessions" in file_name or "activity" in file_name:
-            sessions = parse_fit_sessions(data)
-            for session in sessions:
-                exercises = []
-                for ex_data in session.get("exercises", []):
-                    sets = []
-                    for set_data in ex_data.get("sets", []):
-                        sets.append(
-                            SetRecord(
-                                reps=set_data.get("reps", 0),
-                                weight=set_data.get("weight"),
-                                duration_seconds=set_data.get("duration"),
-                            )
-                        )
-                    exercises.append(
-                        ExerciseRecord(
-                            name=ex_data.get("name", "Unknown"),
-                            sets=sets,
+        """Process a JSON file from Google Fit Takeout.
+
+        Args:
+            file_name: Lower-cased base name of the file, which selects the handler
+        """
+        handler = _match_handler(file_name, self._JSON_HANDLERS)
+        if handler is not None:
+            handler(self, data, workouts, body_metrics, sleep_records)
+
+    def _process_csv_file(
+        self,
+        file_name: str,
+        rows: Iterator[list[str]],
+        workouts: list[WorkoutSession],
+        body_metrics: list[BodyMetric],
+    ) -> None:
+        """Process a CSV file from Google Fit Takeout.
+
+        Args:
+            file_name: Lower-cased base name of the file, which selects the handler
+            rows: csv.reader over the file, header row first
+        """
+        handler = _match_handler(file_name, self._CSV_HANDLERS)
+        if handler is not None:
+            handler(self, rows, workouts, body_metrics)
+
+    def _process_sessions(
+        self,
+        data: dict | list,
+        workouts: list[WorkoutSession],
+        body_metrics: list[BodyMetric],
+        sleep_records: list[SleepRecord],
+    ) -> None:
+        """Activity/workout sessions."""
+        sessions = parse_fit_sessions(data)
+        for session in sessions:
+            exercises = []
+            for ex_data in session.get("exercises", []):
+                sets = []
+                for set_data in ex_data.get("sets", []):
+                    sets.append(
+                        SetRecord(
+                            reps=set_data.get("reps", 0),
+                            weight=set_data.get("weight"),
+                            duration_seconds=set_data.get("duration"),
                         )
                     )
-
-                workouts.append(
-                    WorkoutSession(
-                        start_time=session.get("start_time", datetime.now()),
-                        end_time=session.get("end_time", datetime.now()),
-                        session_type=session.get("activity_type", "strength_training"),
-                        exercises=exercises,
-                        notes=session.get("notes", ""),
-                        source=self.source_name,
+                exercises.append(
+                    ExerciseRecord(
+                        name=ex_data.get("name", "Unknown"),
+                        sets=sets,
                     )
                 )
 
-        # Workout-specific data with weight information
-        elif "workout" in file_name or "exercise" in file_name:
-            workout_data = parse_workout_data(data)
-            for workout in workout_data:
-                exercises = []
-                for ex_data in workout.get("exercises", []):
-                    sets = []
-                    for set_data in ex_data.get("sets", []):
-                        sets.append(
-                            SetRecord(
-                                reps=set_data.get("reps", 0),
-                                weight=set_data.get("weight"),  # Google Fit has this!
-                                duration_seconds=set_data.get("duration"),
-                            )
-                        )
-                    exercises.append(
-                        ExerciseRecord(
-                            name=ex_data.get("name", "Unknown"),
-                            sets=sets,
+            workouts.append(
+                WorkoutSession(
+                    start_time=session.get("start_time", datetime.now()),
+                    end_time=session.get("end_time", datetime.now()),
+                    session_type=session.get("activity_type", "strength_training"),
+                    exercises=exercises,
+                    notes=session.get("notes", ""),
+                    source=self.source_name,
+                )
+            )
+
+    def _process_workouts(
+        self,
+        data: dict | list,
+        workouts: list[WorkoutSession],
+        body_metrics: list[BodyMetric],
+        sleep_records: list[SleepRecord],
+    ) -> None:
+        """Workout-specific data with weight information."""
+        workout_data = parse_workout_data(data)
+        for workout in workout_data:
+            exercises = []
+            for ex_data in workout.get("exercises", []):
+                sets = []
+                for set_data in ex_data.get("sets", []):
+                    sets.append(
+                        SetRecord(
+                            reps=set_data.get("reps", 0),
+                            weight=set_data.get("weight"),  # Google Fit has this!
+                            duration_seconds=set_data.get("duration"),
                         )
                     )
-
-                workouts.append(
-                    WorkoutSession(
-                        start_time=workout.get("start_time", datetime.now()),
-                        end_time=workout.get("end_time", datetime.now()),
-                        session_type="strength_training",
-                        exercises=exercises,
-                        source=self.source_name,
+                exercises.append(
+                    ExerciseRecord(
+                        name=ex_data.get("name", "Unknown"),
+                        sets=sets,
                     )
                 )
 
-        # Body weight data
-        elif "weight" in file_name:
-            if isinstance(data, list):
-                for record in data:
-                    weight = record.get("value") or record.get("weight")
-                    if weight:
-                        body_metrics.append(
-                            BodyMetric(
-                                metric_type="weight",
-                                value=float(weight),
-                                unit="kg",
-                                recorded_at=self._parse_timestamp(
-                                    record.get("date") or record.get("startTime")
-                                ),
-                            )
-                        )
+            workouts.append(
+                WorkoutSession(
+                    start_time=workout.get("start_time", datetime.now()),
+                    end_time=workout.get("end_time", datetime.now()),
+                    session_type="strength_training",
+                    exercises=exercises,
+                    source=self.source_name,
+                )
+            )
 
-        # Sleep data
-        elif "sleep" in file_name:
-            if isinstance(data, list):
-                for record in data:
-                    sleep_records.append(
-                        SleepRecord(
-                            start_time=self._parse_timestamp(record.get("startTime")),
-                            end_time=self._parse_timestamp(record.get("endTime")),
-                            stages={},
+    def _process_weight_json(
+        self,
+        data: dict | list,
+        workouts: list[WorkoutSession],
+        body_metrics: list[BodyMetric],
+        sleep_records: list[SleepRecord],
+    ) -> None:
+        """Body weight data."""
+        if isinstance(data, list):
+            for record in data:
+                weight = record.get("value") or record.get("weight")
+                if weight:
+                    body_metrics.append(
+                        BodyMetric(
+                            metric_type="weight",
+                            value=float(weight),
+                            unit="kg",
+                            recorded_at=_parse_timestamp(
+                                record.get("date") or record.get("startTime")
+                            ),
                         )
                     )
 
-    def _process_csv_file(
+    def _process_sleep_json(
         self,
-        file_path: str,
-        rows: list[dict],
+        data: dict | list,
         workouts: list[WorkoutSession],
         body_metrics: list[BodyMetric],
+        sleep_records: list[SleepRecord],
     ) -> None:
-        """Process a CSV file from Google Fit Takeout."""
-        file_name = Path(file_path).name.lower()
-
-        # Daily activity metrics
-        if "daily" in file_name:
-            metrics = parse_daily_activity_metrics(rows)
-            # These are general activity metrics, not directly used for programs
-            pass
+        """Sleep data."""
+        if isinstance(data, list):
+            for record in data:
+                sleep_records.append(
+                    SleepRecord(
+                        start_time=_parse_timestamp(record.get("startTime")),
+                        end_time=_parse_timestamp(record.get("endTime")),
+                        stages={},
+                    )
+                )
 
-        # Body weight CSV
-        elif "weight" in file_name:
-            for row in rows:
-                weight = row.get("Weight") or row.get("value") or row.get("weight")
-                date = row.get("Date") or row.get("date") or row.get("startTime")
-                if weight and date:
-                    try:
-                        body_metrics.append(
-                            BodyMetric(
-                                metric_type="weight",
-                                value=float(weight),
-                                unit="kg",
-                                recorded_at=self._parse_timestamp(date),
-                            )
-                        )
-                    except (ValueError, TypeError):
-                        continue
-
-    def _parse_timestamp(self, value: str | int | None) -> datetime:
-        """Parse a timestamp value to datetime."""
-        if value is None:
-            return datetime.now()
-
-        if isinstance(value, int):
-            # Milliseconds since epoch
-            if value > 1e12:
-                value = value / 1000
-            return datetime.fromtimestamp(value)
-
-        if isinstance(value, str):
-            # Try various formats
-            formats = [
-                "%Y-%m-%dT%H:%M:%S.%fZ",
-                "%Y-%m-%dT%H:%M:%SZ",
-                "%Y-%m-%dT%H:%M:%S",
-                "%Y-%m-%d %H:%M:%S",
-                "%Y-%m-%d",
-            ]
-            for fmt in formats:
+    def _process_weight_csv(
+        self,
+        rows: Iterator[list[str]],
+        workouts: list[WorkoutSession],
+        body_metrics: list[BodyMetric],
+    ) -> None:
+        """Body weight CSV."""
+        header = next(rows, None)
+        if header is None:
+            return
+        weight_columns = _column_indices(header, ("Weight", "value", "weight"))
+        date_columns = _column_indices(header, ("Date", "date", "startTime"))
+        for row in rows:
+            weight = _first_value(row, weight_columns)
+            date = _first_value(row, date_columns)
+            if weight and date:
                 try:
-                    return datetime.strptime(value, fmt)
-                except ValueError:
+                    body_metrics.append(
+                        BodyMetric(
+                            metric_type="weight",
+                            value=float(weight),
+                            unit="kg",
+                            recorded_at=_parse_timestamp(date),
+                        )
+                    )
+                except (ValueError, TypeError):
                     continue
 
-            # Try ISO format
-            try:
-                return datetime.fromisoformat(value.replace("Z", "+00:00"))
-            except ValueError:
-                pass
-
-        return datetime.now()
+    # (file name substrings, handler); the first match wins
+    _JSON_HANDLERS = (
+        (("sessions", "activity"), _process_sessions),
+        (("workout", "exercise"), _process_workouts),
+        (("weight",), _process_weight_json),
+        (("sleep",), _process_sleep_json),
+    )
+    _CSV_HANDLERS = (
+        # Daily activity metrics are general activity metrics, not directly
+        # used for programs, so those files are skipped
+        (("daily",), None),
+        (("weight",), _process_weight_csv),
+    )
@@ -1,38 +1,81 @@
 """Parsers for Google Fit Takeout JSON/CSV data."""
 
+import re
 from datetime import datetime
+from functools import lru_cache
+
+# Takeout's usual UTC shape, e.g. 2024-01-15T10:00:00.123Z (parsed naive)
+_UTC_ISO_TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d{1,6})?Z")
+
+_TIMESTAMP_FORMATS = (
+    "%Y-%m-%dT%H:%M:%S.%fZ",
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d",
+)
 
 
 def _parse_timestamp(value: str | int | None) -> datetime:
-    """Parse a timestamp value to datetime."""
+    """Parse a timestamp value to datetime.
+
+    Strings of ten or more digits are epoch values, as Takeout often
+    stores startTimeMillis as a string; shorter ones (e.g. 20240115) are
+    left to the date formats.
+    """
     if value is None:
         return datetime.now()
 
+    if isinstance(value, str) and len(value) >= 10 and value.isdigit():
+        value = int(value)
+
     if isinstance(value, int):
-        if value > 1e12:
-            value = value / 1000
+        # Integer arithmetic keeps sub-second parts exact
+        if value > 100_000_000_000_000_000:  # Nanoseconds, e.g. startTimeNanos
+            seconds, nanos = divmod(value, 1_000_000_000)
+            return datetime.fromtimestamp(seconds).replace(microsecond=nanos // 1000)
+        if value > 1_000_000_000_000:  # Milliseconds
+            seconds, millis = divmod(value, 1000)
+            return datetime.fromtimestamp(seconds).replace(microsecond=millis * 1000)
         return datetime.fromtimestamp(value)
 
     if isinstance(value, str):
-        formats = [
-            "%Y-%m-%dT%H:%M:%S.%fZ",
-            "%Y-%m-%dT%H:%M:%SZ",
-            "%Y-%m-%dT%H:%M:%S",
-            "%Y-%m-%d %H:%M:%S",
-            "%Y-%m-%d",
-        ]
-        for fmt in formats:
-            try:
-                return datetime.strptime(value, fmt)
-            except ValueError:
-                continue
+        parsed = _parse_timestamp_string(value)
+        if parsed is not None:
+            return parsed
 
+    return datetime.now()
+
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp_string(value: str) -> datetime | None:
+    """Parse a date/time string, or None if no known format matches.
+
+    Cached, as an export repeats the same dates across many records.
+    """
+    # Fast paths through the C fromisoformat for the common shapes; they
+    # give the same result the formats below would
+    if _UTC_ISO_TIMESTAMP.fullmatch(value):
         try:
-            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+            return datetime.fromisoformat(value[:-1])
+        except ValueError:
+            pass
+    elif "Z" not in value and not value.endswith("z"):
+        try:
+            return datetime.fromisoformat(value)
         except ValueError:
             pass
 
-    return datetime.now()
+    for fmt in _TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
 
 
 # Google Fit exercise type codes
@@ -143,6 +186,11 @@ EXERCISE_TYPE_NAMES = {
     104: "Other",
 }
 
+# EXERCISE_TYPE_NAMES indexed by code, as the codes are dense from 1
+_ACTIVITY_NAMES = tuple(
+    EXERCISE_TYPE_NAMES.get(code, "unknown") for code in range(max(EXERCISE_TYPE_NAMES) + 1)
+)
+
 # Resistance type codes
 RESISTANCE_TYPES = {
     0: "unknown",
@@ -296,16 +344,16 @@ def _parse_exercise_values(values: list) -> dict | None:
             # Named field format
             if "mapVal" in val:
                 for entry in val.get("mapVal", []):
-                    key = entry.get("key", "")
+                    key = entry.get("key", "").lower()
                     value = entry.get("value", {})
 
-                    if "exercise" in key.lower():
+                    if "exercise" in key:
                         exercise["name"] = value.get("stringVal", exercise["name"])
-                    elif "repetition" in key.lower():
+                    elif "repetition" in key:
                         set_data["reps"] = value.get("intVal", 0)
-                    elif "weight" in key.lower():
+                    elif "weight" in key:
                         set_data["weight"] = value.get("fpVal")
-                    elif "duration" in key.lower():
+                    elif "duration" in key:
                         set_data["duration"] = value.get("intVal", 0) / 1000
 
     if set_data.get("reps", 0) > 0 or set_data.get("weight"):
@@ -317,6 +365,8 @@ def _parse_exercise_values(values: list) -> dict | None:
 
 def _get_activity_name(activity_type: int | None) -> str:
     """Get activity name from type code."""
+    if type(activity_type) is int and 0 <= activity_type < len(_ACTIVITY_NAMES):
+        return _ACTIVITY_NAMES[activity_type]
     if activity_type is None:
         return "unknown"
     return EXERCISE_TYPE_NAMES.get(activity_type, "unknown")
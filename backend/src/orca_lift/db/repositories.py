@@ -1,6 +1,7 @@
 """Data access layer for orca-lift."""
 
 import json
+from collections.abc import Sequence
 from datetime import datetime
 from pathlib import Path
 
@@ -443,16 +444,19 @@ class ExerciseRepository:
             rows = await cursor.fetchall()
             return [self._row_to_exercise(row) for row in rows]
 
-    async def get_by_muscle_group(self, muscle_group: MuscleGroup) -> list[Exercise]:
-        """Get exercises targeting a muscle group."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            cursor = await db.execute(
-                "SELECT * FROM exercises WHERE muscle_groups LIKE ?",
-                (f'%"{muscle_group.value}"%',),
-            )
-            rows = await cursor.fetchall()
-            return [self._row_to_exercise(row) for row in rows]
+    async def get_by_muscle_group(
+        self,
+        muscle_group: MuscleGroup,
+        equipment_types: Sequence[EquipmentType] | None = None,
+    ) -> list[Exercise]:
+        """Get exercises targeting a muscle group.
+
+        If equipment_types is given, only exercises that can be performed
+        with at least one of them are returned.
+        """
+        return await self._query(
+            "muscle_groups LIKE ?", (f'%"{muscle_group.value}"%',), equipment_types
+        )
 
     async def get_by_movement_pattern(
         self, pattern: MovementPattern
@@ -496,23 +500,45 @@ class ExerciseRepository:
             return cursor.lastrowid
 
     async def get_by_equipment(
-        self, equipment_types: list[EquipmentType]
+        self, equipment_types: Sequence[EquipmentType]
     ) -> list[Exercise]:
         """Get exercises that can be performed with the given equipment types."""
-        all_exercises = await self.list_all()
-        filtered = []
-        for exercise in all_exercises:
-            # Exercise is available if ANY of its equipment options is available
-            if any(eq in equipment_types for eq in exercise.equipment):
-                filtered.append(exercise)
-        return filtered
-
-    async def get_compound_exercises(self) -> list[Exercise]:
-        """Get all compound exercises."""
+        return await self._query("1", (), equipment_types)
+
+    async def get_compound_exercises(
+        self, equipment_types: Sequence[EquipmentType] | None = None
+    ) -> list[Exercise]:
+        """Get all compound exercises.
+
+        If equipment_types is given, only exercises that can be performed
+        with at least one of them are returned.
+        """
+        return await self._query("is_compound = 1", (), equipment_types)
+
+    async def _query(
+        self,
+        where: str,
+        params: tuple,
+        equipment_types: Sequence[EquipmentType] | None,
+    ) -> list[Exercise]:
+        """Select exercises matching a WHERE clause, ordered by name.
+
+        An exercise is available if ANY of its equipment options is in
+        equipment_types; the check runs in SQL over the JSON equipment column.
+        """
+        if equipment_types is not None:
+            if not equipment_types:
+                return []
+            placeholders = ", ".join("?" * len(equipment_types))
+            where = (
+                f"({where}) AND EXISTS (SELECT 1 FROM json_each(exercises.equipment)"
+                f" WHERE json_each.value IN ({placeholders}))"
+            )
+            params = (*params, *(eq.value for eq in equipment_types))
         async with aiosqlite.connect(self.db_path) as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
-                "SELECT * FROM exercises WHERE is_compound = 1 ORDER BY name"
+                f"SELECT * FROM exercises WHERE {where} ORDER BY name", params
             )
             rows = await cursor.fetchall()
             return [self._row_to_exercise(row) for row in rows]
@@ -2,6 +2,7 @@
 
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import cached_property
 
 
 class MuscleGroup(str, Enum):
@@ -106,13 +107,23 @@ class Exercise:
     # ID
     id: int | None = None
 
+    @cached_property
+    def muscle_group_values(self) -> tuple[str, ...]:
+        """Values of the targeted muscle groups, built on first access."""
+        return tuple(mg.value for mg in self.muscle_groups)
+
+    @cached_property
+    def equipment_values(self) -> tuple[str, ...]:
+        """Values of the equipment options, built on first access."""
+        return tuple(eq.value for eq in self.equipment)
+
     def to_dict(self) -> dict:
         """Convert to dictionary for storage."""
         return {
             "name": self.name,
-            "muscle_groups": [mg.value for mg in self.muscle_groups],
+            "muscle_groups": list(self.muscle_group_values),
             "movement_pattern": self.movement_pattern.value,
-            "equipment": [eq.value for eq in self.equipment],
+            "equipment": list(self.equipment_values),
             "category": self.category.value,
             "aliases": self.aliases,
             "liftosaur_id": self.liftosaur_id,
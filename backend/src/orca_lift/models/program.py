@@ -16,9 +16,21 @@ class ProgressionScheme(str, Enum):
     PERCENTAGE = "pct"  # Percentage-based progression
 
 
-@dataclass
+_PROGRESSION_BY_VALUE = {p.value: p for p in ProgressionScheme}
+
+
+def parse_progression(
+    value, default: ProgressionScheme = ProgressionScheme.DOUBLE
+) -> ProgressionScheme:
+    """Map a progression value from AI output to a scheme, or default if unknown."""
+    if not isinstance(value, str):
+        return default
+    return _PROGRESSION_BY_VALUE.get(value, default)
+
+
+@dataclass(frozen=True, slots=True)
 class SetScheme:
-    """Defines a set structure."""
+    """Defines a set structure (immutable, so instances can be shared)."""
 
     reps: int | str  # int or "5+" for AMRAP
     weight_percent: float | None = None  # Percentage of 1RM or working weight
@@ -28,7 +40,7 @@ class SetScheme:
     rest_seconds: int | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ProgramExercise:
     """An exercise within a training day."""
 
@@ -101,7 +113,7 @@ class ProgramExercise:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ProgramDay:
     """A single training day."""
 
@@ -130,7 +142,7 @@ class ProgramDay:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ProgramWeek:
     """A week in the program (for periodization)."""
 
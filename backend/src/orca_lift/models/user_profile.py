@@ -3,6 +3,7 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
 
 from .exercises import EquipmentType
 
@@ -161,13 +162,27 @@ class UserProfile:
             updated_at=updated_at,
         )
 
+    @cached_property
+    def summary(self) -> str:
+        """AI context summary, built on first access.
+
+        Profiles are not edited after they are loaded, so the summary is
+        computed once and reused by every prompt that needs it.
+        """
+        return self.get_summary()
+
+    @cached_property
+    def equipment_values(self) -> tuple[str, ...]:
+        """Values of the available equipment types, built on first access."""
+        return tuple(eq.value for eq in self.available_equipment)
+
     def get_summary(self) -> str:
         """Generate a summary for AI context."""
         summary = f"User: {self.name}\n"
         summary += f"Experience: {self.experience_level.value}\n"
         summary += f"Goals: {', '.join(g.value for g in self.goals)}\n"
         summary += f"Training days: {self.schedule_days}/week, {self.session_duration} min/session\n"
-        summary += f"Equipment: {', '.join(eq.value for eq in self.available_equipment)}\n"
+        summary += f"Equipment: {', '.join(self.equipment_values)}\n"
 
         if self.strength_levels:
             summary += "Current strength:\n"
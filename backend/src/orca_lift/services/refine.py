@@ -8,15 +8,17 @@ import json
 import re
 from typing import Awaitable, Callable
 
-from orca import CongregationEventType
+from orca import AgentChat, CongregationEventType, ModelType
 
 from ..agents.congregation import (
     CongregationResult,
     run_congregation,
     run_congregation_stream,
+    specialist_event_data,
 )
 from ..agents.liftoscript_converter import LiftoscriptConverter
 from ..agents.liftoscript_spec import LIFTOSCRIPT_FULL_SPEC
+from ..agents.output_specs import final_program_specs
 from ..agents.prompts import format_constraint_checklist, format_equipment_constraints
 from ..agents.tools import set_current_specialist, set_profile_context
 from ..generators.liftoscript import LiftoscriptGenerator
@@ -25,8 +27,8 @@ from ..models.program import (
     ProgramDay,
     ProgramExercise,
     ProgramWeek,
-    ProgressionScheme,
     SetScheme,
+    parse_progression,
 )
 from ..models.user_profile import UserProfile
 from ..validators import validate_program_constraints
@@ -93,7 +95,7 @@ class RefinementService:
 
         user_summary = ""
         if user_profile:
-            user_summary = user_profile.get_summary() + "\n\n"
+            user_summary = user_profile.summary + "\n\n"
 
         user_summary += f"""REFINEMENT REQUEST (this is a modification to an existing program, NOT a new program):
 
@@ -272,7 +274,7 @@ Keep everything else the same. Return the COMPLETE updated program structure."""
                 line += f" — suggestion: {v.suggestion}"
             violation_lines.append(line)
 
-        eq_list = ", ".join(eq.value for eq in user_profile.available_equipment)
+        eq_list = ", ".join(user_profile.equipment_values)
         limitations_str = ""
         if user_profile.limitations:
             lim_lines = []
@@ -304,12 +306,9 @@ INSTRUCTIONS:
 4. Return the complete corrected program with the same JSON structure"""
 
         try:
-            from orca import AgentChat, ModelType as OrcaModelType
-            from ..agents.output_specs import final_program_specs
-
             chat = AgentChat(
                 system_prompt="You are a program correction assistant. Fix the specified constraint violations in the training program.",
-                model_type=OrcaModelType.SONNET,
+                model_type=ModelType.SONNET,
                 output_specs=final_program_specs,
             )
 
@@ -353,15 +352,16 @@ INSTRUCTIONS:
             profile_id=profile_id,
             constraint_checklist=constraint_checklist,
         ):
-            if event.type == CongregationEventType.CLIENT_START:
-                persona_name = event.data.get("persona_name", "Specialist")
+            etype, data = event.type, event.data
+            if etype == CongregationEventType.CLIENT_START:
+                persona_name = data.get("persona_name", "Specialist")
                 set_current_specialist(persona_name)
 
-            elif event.type == CongregationEventType.CLIENT_RESPONSE:
-                client_id = event.data.get("client_id", "")
-                persona_name = event.data.get("persona_name", "")
-                thoughts = event.data.get("thoughts", "")
-                aligned = event.data.get("aligned")
+            elif etype == CongregationEventType.CLIENT_RESPONSE:
+                client_id = data.get("client_id", "")
+                persona_name = data.get("persona_name", "")
+                thoughts = data.get("thoughts", "")
+                aligned = data.get("aligned")
 
                 deliberation_log.append({
                     "client_id": client_id,
@@ -370,20 +370,17 @@ INSTRUCTIONS:
                 })
 
                 if thoughts:
-                    preview = thoughts[:200] + "..." if len(thoughts) > 200 else thoughts
-                    await notify("specialist", persona_name, {
-                        "preview": preview,
-                        "full": thoughts,
-                        "aligned": aligned,
-                    })
-
-            elif event.type == CongregationEventType.TURN_START:
-                turn = event.data.get("turn", 0)
+                    await notify(
+                        "specialist", persona_name, specialist_event_data(thoughts, aligned)
+                    )
+
+            elif etype == CongregationEventType.TURN_START:
+                turn = data.get("turn", 0)
                 await notify("phase", f"Deliberation round {turn}...")
 
-            elif event.type == CongregationEventType.CLIENT_INFO_REQUEST:
-                persona_name = event.data.get("persona_name", "Specialist")
-                requests = event.data.get("requests", [])
+            elif etype == CongregationEventType.CLIENT_INFO_REQUEST:
+                persona_name = data.get("persona_name", "Specialist")
+                requests = data.get("requests", [])
                 if requests:
                     func_names = [
                         r.get("identifier", "") for r in requests if r.get("identifier")
@@ -393,12 +390,12 @@ INSTRUCTIONS:
                             "functions": func_names,
                         })
 
-            elif event.type == CongregationEventType.MEDIATOR_SYNTHESIS:
+            elif etype == CongregationEventType.MEDIATOR_SYNTHESIS:
                 await notify("phase", "Mediator synthesizing final program...")
-                captured_mediator_output = event.data.get("output")
+                captured_mediator_output = data.get("output")
 
-            elif event.type == CongregationEventType.COMPLETED:
-                result = event.data.get("result")
+            elif etype == CongregationEventType.COMPLETED:
+                result = data.get("result")
                 if result:
                     raw_output = result.final_output or captured_mediator_output or {}
                     final_program = raw_output
@@ -513,72 +510,61 @@ INSTRUCTIONS:
         Uses the same robust type coercion as executor._build_program:
         handles int/str sets, reps_min/reps_max, cardio skipping, etc.
         """
-        new_weeks = []
-
-        for week_data in weeks_data:
-            if not isinstance(week_data, dict):
-                continue
-
-            new_days = []
-            for day_data in week_data.get("days", []):
-                if not isinstance(day_data, dict):
-                    continue
-
-                new_exercises = []
-                for ex_data in day_data.get("exercises", []):
-                    if not isinstance(ex_data, dict):
-                        continue
-
-                    # Skip cardio/duration-based exercises (can't express in Liftoscript)
-                    if "duration_minutes" in ex_data and "reps_min" not in ex_data:
-                        continue
-
-                    # Build sets — handle both congregation format (sets/reps_min/reps_max)
-                    # and simple format (sets: "4x8")
-                    sets = self._parse_exercise_sets(ex_data)
-
-                    # Map progression type
-                    prog_str = ex_data.get("progression", "dp")
-                    try:
-                        progression = ProgressionScheme(prog_str)
-                    except ValueError:
-                        progression = ProgressionScheme.DOUBLE
-
-                    # Coerce increment to a number
-                    raw_increment = ex_data.get("increment", 5)
-                    if not isinstance(raw_increment, (int, float)):
-                        try:
-                            raw_increment = float(raw_increment)
-                        except (ValueError, TypeError):
-                            raw_increment = 5
-
-                    new_exercises.append(
-                        ProgramExercise(
-                            name=ex_data.get("name", "Unknown"),
-                            sets=sets,
-                            progression=progression,
-                            progression_params={"increment": raw_increment},
-                            notes=ex_data.get("notes", ""),
-                        )
-                    )
-
-                new_days.append(
+        return [
+            ProgramWeek(
+                week_number=week_data.get("week_number", week_number),
+                days=[
                     ProgramDay(
-                        name=day_data.get("name", f"Day {len(new_days) + 1}"),
+                        name=day_data.get("name", f"Day {day_number}"),
                         focus=day_data.get("focus", ""),
-                        exercises=new_exercises,
+                        exercises=[
+                            exercise
+                            for ex_data in day_data.get("exercises", [])
+                            if (exercise := self._build_exercise(ex_data)) is not None
+                        ],
                     )
-                )
-
-            new_weeks.append(
-                ProgramWeek(
-                    week_number=week_data.get("week_number", len(new_weeks) + 1),
-                    days=new_days,
-                    deload=week_data.get("is_deload", False),
-                )
+                    for day_number, day_data in enumerate(
+                        [d for d in week_data.get("days", []) if isinstance(d, dict)], 1
+                    )
+                ],
+                deload=week_data.get("is_deload", False),
+            )
+            for week_number, week_data in enumerate(
+                [w for w in weeks_data if isinstance(w, dict)], 1
             )
+        ]
+
+    def _build_exercise(self, ex_data) -> ProgramExercise | None:
+        """Build one ProgramExercise, or None for malformed/cardio entries."""
+        if not isinstance(ex_data, dict):
+            return None
+
+        # Skip cardio/duration-based exercises (can't express in Liftoscript)
+        if "duration_minutes" in ex_data and "reps_min" not in ex_data:
+            return None
+
+        # Build sets — handle both congregation format (sets/reps_min/reps_max)
+        # and simple format (sets: "4x8")
+        sets = self._parse_exercise_sets(ex_data)
 
-        return new_weeks
+        # Map progression type
+        progression = parse_progression(ex_data.get("progression", "dp"))
+
+        # Coerce increment to a number
+        raw_increment = ex_data.get("increment", 5)
+        if not isinstance(raw_increment, (int, float)):
+            try:
+                raw_increment = float(raw_increment)
+            except (ValueError, TypeError):
+                raw_increment = 5
+
+        return ProgramExercise(
+            name=ex_data.get("name", "Unknown"),
+            sets=sets,
+            progression=progression,
+            progression_params={"increment": raw_increment},
+            notes=ex_data.get("notes", ""),
+        )
 
     def _parse_exercise_sets(self, ex_data: dict) -> list[SetScheme]:
         """Parse exercise set data handling both congregation and simple formats.
@@ -615,48 +601,31 @@ INSTRUCTIONS:
                 reps_max = reps_min
 
         is_amrap = ex_data.get("is_amrap_final_set", False)
+        reps = reps_min if reps_min == reps_max else f"{reps_min}-{reps_max}"
+        rpe = ex_data.get("rpe_target")
+        last = num_sets - 1
 
-        sets = []
-        for i in range(num_sets):
-            is_last = i == num_sets - 1
-            reps = reps_min if reps_min == reps_max else f"{reps_min}-{reps_max}"
-            sets.append(
-                SetScheme(
-                    reps=reps,
-                    rpe=ex_data.get("rpe_target"),
-                    is_amrap=is_last and is_amrap,
-                )
-            )
-
-        return sets
+        return [
+            SetScheme(reps=reps, rpe=rpe, is_amrap=i == last and is_amrap)
+            for i in range(num_sets)
+        ]
 
     def _parse_sets_string(self, sets_str: str) -> list[SetScheme]:
         """Parse a sets string like '4x8' or '3x8-12' into SetScheme list."""
-        sets = []
-
         # Handle formats: 4x8, 3x8-12, 5x5+
         match = re.match(r"(\d+)x(\d+)(?:-(\d+))?(\+)?", str(sets_str))
-        if match:
-            num_sets = int(match.group(1))
-            reps_min = int(match.group(2))
-            reps_max = int(match.group(3)) if match.group(3) else reps_min
-            is_amrap = bool(match.group(4))
-
-            for i in range(num_sets):
-                is_last = i == num_sets - 1
-                reps = reps_min if reps_min == reps_max else f"{reps_min}-{reps_max}"
-                sets.append(
-                    SetScheme(
-                        reps=reps,
-                        is_amrap=is_last and is_amrap,
-                    )
-                )
-        else:
+        if not match:
             # Default fallback
-            for _ in range(3):
-                sets.append(SetScheme(reps=10))
+            return [SetScheme(reps=10) for _ in range(3)]
+
+        num_sets = int(match.group(1))
+        reps_min = int(match.group(2))
+        reps_max = int(match.group(3)) if match.group(3) else reps_min
+        is_amrap = bool(match.group(4))
+        reps = reps_min if reps_min == reps_max else f"{reps_min}-{reps_max}"
+        last = num_sets - 1
 
-        return sets
+        return [SetScheme(reps=reps, is_amrap=i == last and is_amrap) for i in range(num_sets)]
 
     def reset_conversation(self):
         """Reset conversation history."""
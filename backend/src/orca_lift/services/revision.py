@@ -1,6 +1,7 @@
 """Program revision service for partial regeneration."""
 
 import json
+import re
 
 from ..agents.congregation import run_congregation
 from ..generators.liftoscript import LiftoscriptGenerator
@@ -75,7 +76,7 @@ class RevisionService:
         )
 
         # Build user summary
-        user_summary = user_profile.get_summary()
+        user_summary = user_profile.summary
 
         # Build revision context
         remaining_weeks = total_weeks - from_week + 1
@@ -259,8 +260,6 @@ the revision feedback into the remaining weeks.
 
     def _parse_sets(self, sets_str: str) -> list[SetScheme]:
         """Parse sets string into SetScheme objects."""
-        import re
-
         sets = []
         match = re.match(r"(\d+)x(\d+)(?:-(\d+))?(\+)?", str(sets_str))
 
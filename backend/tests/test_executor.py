@@ -0,0 +1,96 @@
+"""Tests for the program generation executor."""
+
+import asyncio
+
+import pytest
+
+from orca_lift.agents import ProgramExecutor
+from orca_lift.agents.executor import DEFAULT_CONGREGATION_TIMEOUT_SECONDS, _congregation_timeout
+
+
+class TestProgressCallback:
+    """Tests for progress delivery during execute."""
+
+    async def test_events_delivered_before_return(self, monkeypatch, sample_user_profile):
+        """Test every event reaches the callback, in order, before execute returns."""
+        delivered = []
+
+        async def on_progress(event_type, message, data):
+            await asyncio.sleep(0)
+            delivered.append(message)
+
+        async def fake_execute(self, *args, notify, streaming):
+            for step in range(5):
+                notify("phase", f"Step {step}")
+            return "result"
+
+        monkeypatch.setattr(ProgramExecutor, "_execute", fake_execute)
+
+        result = await ProgramExecutor(verbose=False).execute(
+            user_profile=sample_user_profile,
+            goals="Build strength",
+            on_progress=on_progress,
+        )
+
+        assert result == "result"
+        assert delivered == [f"Step {step}" for step in range(5)]
+
+    async def test_callback_error_cancels_pipeline(self, monkeypatch, sample_user_profile):
+        """Test the first callback error cancels the pipeline and is re-raised."""
+        delivered = []
+        steps = []
+
+        async def on_progress(event_type, message, data):
+            delivered.append(message)
+            raise ConnectionError("client went away")
+
+        async def fake_execute(self, *args, notify, streaming):
+            try:
+                for step in range(100):
+                    steps.append(step)
+                    notify("phase", f"Step {step}")
+                    await asyncio.sleep(0.01)
+            except asyncio.CancelledError:
+                steps.append("cancelled")
+                raise
+
+        monkeypatch.setattr(ProgramExecutor, "_execute", fake_execute)
+
+        with pytest.raises(ConnectionError, match="client went away"):
+            await ProgramExecutor(verbose=False).execute(
+                user_profile=sample_user_profile,
+                goals="Build strength",
+                on_progress=on_progress,
+            )
+
+        assert delivered == ["Step 0"]
+        assert steps[-1] == "cancelled"
+        assert len(steps) < 10
+
+
+class TestCongregationTimeout:
+    """Tests for the ORCA_LIFT_CONGREGATION_TIMEOUT setting."""
+
+    def test_default_and_override(self, monkeypatch):
+        """Test the default applies when unset and a number overrides it."""
+        monkeypatch.delenv("ORCA_LIFT_CONGREGATION_TIMEOUT", raising=False)
+        assert _congregation_timeout() == DEFAULT_CONGREGATION_TIMEOUT_SECONDS
+
+        monkeypatch.setenv("ORCA_LIFT_CONGREGATION_TIMEOUT", "90")
+        assert _congregation_timeout() == 90.0
+
+    async def test_invalid_value_fails_generation_before_model_calls(
+        self, monkeypatch, sample_user_profile
+    ):
+        """Test a bad value raises an error naming the variable from execute."""
+        monkeypatch.setenv("ORCA_LIFT_CONGREGATION_TIMEOUT", "20m")
+
+        async def on_progress(event_type, message, data):
+            pass
+
+        with pytest.raises(ValueError, match="ORCA_LIFT_CONGREGATION_TIMEOUT.*'20m'"):
+            await ProgramExecutor(verbose=False).execute(
+                user_profile=sample_user_profile,
+                goals="Build strength",
+                on_progress=on_progress,
+            )
@@ -0,0 +1,76 @@
+"""Tests for the Google Fit Takeout client."""
+
+import json
+import zipfile
+from datetime import datetime, timedelta
+
+from orca_lift.clients.base import ExerciseRecord, SetRecord, WorkoutSession
+from orca_lift.clients.google_fit import GoogleFitClient
+
+
+def _workout(start: datetime, *exercise_names: str) -> WorkoutSession:
+    return WorkoutSession(
+        start_time=start,
+        end_time=start + timedelta(hours=1),
+        session_type="strength_training",
+        exercises=[ExerciseRecord(name=name, sets=[SetRecord(reps=5)]) for name in exercise_names],
+    )
+
+
+class TestMergeResults:
+    """Tests for combining per-file parse results."""
+
+    def test_session_repeated_across_files_is_dropped(self):
+        """Test a later file's copy of a session is dropped and distinct ones kept."""
+        start = datetime(2024, 1, 15, 10, 30)
+        first = _workout(start, "Squat")
+        repeat = _workout(start, "Squat")
+        different_exercise = _workout(start, "Deadlift")
+
+        data = GoogleFitClient()._merge_results(
+            [([first], [], []), ([repeat, different_exercise], [], [])],
+            raw_data={},
+        )
+
+        assert data.workouts == [first, different_exercise]
+        assert data.workouts[0] is first
+
+    def test_sessions_within_one_file_are_kept(self):
+        """Test matching sessions in the same file are not merged."""
+        start = datetime(2024, 1, 15, 10, 30)
+        workouts = [_workout(start, "Squat"), _workout(start, "Squat")]
+
+        data = GoogleFitClient()._merge_results([(workouts, [], [])], raw_data={})
+
+        assert len(data.workouts) == 2
+
+
+class TestParseZip:
+    """Tests for parsing a Takeout ZIP file."""
+
+    async def test_zip_matches_extracted_directory(self, tmp_path):
+        """Test JSON and CSV entries read from a ZIP parse as they do from disk."""
+        files = {
+            "Takeout/Fit/weight_1.json": json.dumps(
+                [{"value": 80 + i / 10, "date": "2024-01-15"} for i in range(50)]
+            ),
+            "Takeout/Fit/weight_2.json": json.dumps([{"value": 90, "date": "2024-01-16"}]),
+            "Takeout/Fit/Weight/weight.csv": "Weight,Date\n"
+            + "".join(f"{70 + i},2024-02-{i + 1:02d}\n" for i in range(20)),
+        }
+        zip_path = tmp_path / "takeout.zip"
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, content in files.items():
+                zf.writestr(name, content)
+        with zipfile.ZipFile(zip_path) as zf:
+            zf.extractall(tmp_path / "extracted")
+
+        client = GoogleFitClient()
+        from_zip = await client.parse(str(zip_path))
+        from_dir = await client.parse(str(tmp_path / "extracted"))
+
+        def values(data):
+            return sorted(metric.value for metric in data.body_metrics)
+
+        assert len(from_zip.body_metrics) == 71
+        assert values(from_zip) == values(from_dir)
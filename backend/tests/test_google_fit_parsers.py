@@ -0,0 +1,61 @@
+"""Tests for Google Fit Takeout parsers."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from orca_lift.clients.google_fit.parsers import _parse_timestamp
+
+# Epoch inputs map to local time, so build their expectations the same way
+EPOCH = 1705314600  # 2024-01-15T10:30:00Z
+
+
+class TestParseTimestamp:
+    """Tests for _parse_timestamp."""
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            # ISO strings in UTC come back naive, as the strptime formats did
+            ("2024-01-15T10:30:00Z", datetime(2024, 1, 15, 10, 30)),
+            ("2024-01-15T10:30:00.123Z", datetime(2024, 1, 15, 10, 30, 0, 123000)),
+            ("2024-01-15T10:30:00z", datetime(2024, 1, 15, 10, 30)),
+            ("2024-01-15T10:30:00", datetime(2024, 1, 15, 10, 30)),
+            ("2024-01-15 10:30:00", datetime(2024, 1, 15, 10, 30)),
+            ("2024-01-15", datetime(2024, 1, 15)),
+            ("2024-1-5", datetime(2024, 1, 5)),
+            ("20240115", datetime(2024, 1, 15)),
+            (
+                "2024-01-15T10:30:00+02:00",
+                datetime(2024, 1, 15, 10, 30, tzinfo=timezone(timedelta(hours=2))),
+            ),
+            # Epoch values, as ints or digit strings
+            (EPOCH, datetime.fromtimestamp(EPOCH)),
+            (str(EPOCH), datetime.fromtimestamp(EPOCH)),
+            (EPOCH * 1000 + 123, datetime.fromtimestamp(EPOCH).replace(microsecond=123000)),
+            (
+                str(EPOCH * 1000 + 123),
+                datetime.fromtimestamp(EPOCH).replace(microsecond=123000),
+            ),
+            (
+                EPOCH * 1_000_000_000 + 123_456_789,
+                datetime.fromtimestamp(EPOCH).replace(microsecond=123456),
+            ),
+            (
+                str(EPOCH * 1_000_000_000 + 123_456_789),
+                datetime.fromtimestamp(EPOCH).replace(microsecond=123456),
+            ),
+        ],
+    )
+    def test_parse(self, value, expected):
+        """Test each supported timestamp shape."""
+        parsed = _parse_timestamp(value)
+        assert parsed == expected
+        assert parsed.tzinfo == expected.tzinfo
+
+    @pytest.mark.parametrize("value", [None, "not a date", "2024-13-45"])
+    def test_missing_or_invalid_falls_back_to_now(self, value):
+        """Test missing and unparseable values fall back to the current time."""
+        before = datetime.now()
+        parsed = _parse_timestamp(value)
+        assert before <= parsed <= datetime.now()
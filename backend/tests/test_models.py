@@ -62,6 +62,19 @@ class TestExercise:
         assert MuscleGroup.QUADS in exercise.muscle_groups
         assert exercise.movement_pattern == MovementPattern.SQUAT
 
+    def test_exercise_cached_values(self):
+        """Test cached enum values match the muscle groups and equipment."""
+        exercise = Exercise(
+            name="Row",
+            muscle_groups=[MuscleGroup.BACK, MuscleGroup.BICEPS],
+            movement_pattern=MovementPattern.PULL_HORIZONTAL,
+            equipment=[EquipmentType.BARBELL, EquipmentType.DUMBBELL],
+        )
+
+        assert exercise.muscle_group_values == ("back", "biceps")
+        assert exercise.equipment_values == ("barbell", "dumbbell")
+        assert exercise.equipment_values is exercise.equipment_values
+
     def test_common_exercises_populated(self):
         """Test that common exercises are populated."""
         assert len(COMMON_EXERCISES) > 0
@@ -150,6 +163,14 @@ class TestUserProfile:
         assert "Squat" in summary
         assert "Bad shoulder" in summary
 
+    def test_profile_cached_summary(self, sample_user_profile):
+        """Test cached summary and equipment values match the computed ones."""
+        assert sample_user_profile.summary == sample_user_profile.get_summary()
+        assert sample_user_profile.summary is sample_user_profile.summary
+        assert sample_user_profile.equipment_values == tuple(
+            eq.value for eq in sample_user_profile.available_equipment
+        )
+
 
 class TestProgram:
     """Tests for Program model."""
@@ -0,0 +1,30 @@
+"""Tests for the generation plan builder."""
+
+import pytest
+
+from orca_lift.agents.plan_builder import _escape_for_prompt
+
+
+class TestEscapeForPrompt:
+    """Tests for _escape_for_prompt."""
+
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("Bench 3x5 {heavy}", "Bench 3x5 {heavy}"),
+            ("{{user_analysis}}", "{ {user_analysis} }"),
+            ("{{{x}}}", "{ { {x} } }"),
+            ("{{{{x}}}}", "{ { { {x} } } }"),
+            ("```python\nprint()\n```", "'''python\nprint()\n'''"),
+        ],
+    )
+    def test_escape(self, text, expected):
+        """Test fences and brace runs are neutralized and single braces kept."""
+        assert _escape_for_prompt(text) == expected
+
+    @pytest.mark.parametrize("text", ["{{{x}}}", "a{{{{{b}}}}}c", "{{}}{{"])
+    def test_no_double_braces_remain(self, text):
+        """Test no run of braces of any length survives escaping."""
+        escaped = _escape_for_prompt(text)
+        assert "{{" not in escaped
+        assert "}}" not in escaped
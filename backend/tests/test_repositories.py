@@ -0,0 +1,69 @@
+"""Tests for the data access layer."""
+
+import pytest
+
+from orca_lift.db.engine import init_db, seed_exercises
+from orca_lift.db.repositories import ExerciseRepository
+from orca_lift.models.exercises import (
+    EquipmentType,
+    Exercise,
+    MovementPattern,
+    MuscleGroup,
+)
+
+HOME_GYM = [EquipmentType.DUMBBELL, EquipmentType.BODYWEIGHT]
+
+
+def _available(exercises: list[Exercise], equipment_types) -> list[str]:
+    """Names of the exercises doable with any of equipment_types."""
+    return [ex.name for ex in exercises if any(eq in equipment_types for eq in ex.equipment)]
+
+
+@pytest.fixture
+async def exercise_repo(temp_db_path):
+    """Seeded exercise repository, plus one exercise with several equipment options."""
+    await init_db(temp_db_path)
+    await seed_exercises(temp_db_path)
+    repo = ExerciseRepository(temp_db_path)
+    await repo.add(
+        Exercise(
+            name="Floor Press",
+            muscle_groups=[MuscleGroup.CHEST, MuscleGroup.TRICEPS],
+            movement_pattern=MovementPattern.PUSH_HORIZONTAL,
+            equipment=[EquipmentType.BARBELL, EquipmentType.DUMBBELL],
+        )
+    )
+    return repo
+
+
+class TestExerciseRepositoryEquipmentFilter:
+    """Tests for filtering exercises by available equipment."""
+
+    async def test_get_by_muscle_group(self, exercise_repo):
+        """Test the equipment filter keeps exercises matching any listed type."""
+        unfiltered = await exercise_repo.get_by_muscle_group(MuscleGroup.CHEST)
+        filtered = await exercise_repo.get_by_muscle_group(MuscleGroup.CHEST, HOME_GYM)
+
+        assert [ex.name for ex in filtered] == _available(unfiltered, HOME_GYM)
+        assert "Floor Press" in [ex.name for ex in filtered]
+        assert len(filtered) < len(unfiltered)
+
+    async def test_get_compound_exercises(self, exercise_repo):
+        """Test compound exercises are filtered the same way."""
+        unfiltered = await exercise_repo.get_compound_exercises()
+        filtered = await exercise_repo.get_compound_exercises(HOME_GYM)
+
+        assert [ex.name for ex in filtered] == _available(unfiltered, HOME_GYM)
+        assert 0 < len(filtered) < len(unfiltered)
+
+    async def test_get_by_equipment(self, exercise_repo):
+        """Test get_by_equipment matches filtering the full list."""
+        everything = await exercise_repo.list_all()
+        filtered = await exercise_repo.get_by_equipment(HOME_GYM)
+
+        assert [ex.name for ex in filtered] == _available(everything, HOME_GYM)
+
+    async def test_empty_equipment_types(self, exercise_repo):
+        """Test an empty equipment list matches nothing, unlike None."""
+        assert await exercise_repo.get_compound_exercises([]) == []
+        assert await exercise_repo.get_compound_exercises(None)
@@ -0,0 +1,48 @@
+"""Tests for the Liftosaur exercise sync script."""
+
+import importlib.util
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+SCRIPT_PATH = Path(__file__).parent.parent / "scripts" / "sync_liftosaur_exercises.py"
+
+EXERCISE_TS = """
+export const allExercisesList = {
+  benchPress: { id: "benchPress", name: "Bench Press", defaultWarmup: 10 },
+};
+
+export const metadata = {
+  benchPress: {
+    targetMuscles: ["Pectoralis Major"],
+    synergistMuscles: ["Triceps"],
+    bodyParts: ["Chest"],
+    sortedEquipment: ["barbell", "dumbbell"],
+  },
+};
+"""
+
+
+@pytest.fixture
+def sync_script(monkeypatch):
+    """Load the sync script with the download replaced by a fixed exercise.ts."""
+    spec = importlib.util.spec_from_file_location("sync_liftosaur_exercises", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(module, "fetch_exercise_file", lambda: EXERCISE_TS)
+    return module
+
+
+class TestSync:
+    """Tests for writing the synced exercise list."""
+
+    def test_sync_writes_json_to_text_stream(self, sync_script):
+        """Test _sync writes the JSON to a text stream without a .buffer."""
+        out = io.StringIO()
+        sync_script._sync(out)
+
+        payload = json.loads(out.getvalue())
+        assert payload["exercises"][0]["name"] == "Bench Press"
+        assert "Bench Press, Barbell" in payload["valid_names"]
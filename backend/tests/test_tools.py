@@ -0,0 +1,42 @@
+"""Tests for congregation tools."""
+
+import asyncio
+
+from orca_lift.agents.tools import (
+    answer_question,
+    ask_human,
+    set_current_specialist,
+    set_profile_context,
+    set_question_callback,
+)
+
+
+class TestAskHuman:
+    """Tests for the ask_human tool."""
+
+    async def test_ask_human_names_specialist_set_after_task_start(self):
+        """Test a task created before CLIENT_START still reports its specialist."""
+        asked = []
+
+        async def question_callback(question_id, specialist_name, question):
+            asked.append((specialist_name, question))
+            answer_question(question_id, "Mornings")
+
+        set_profile_context(1)
+        set_question_callback(question_callback)
+        try:
+            may_ask = asyncio.Event()
+
+            async def specialist():
+                await may_ask.wait()
+                return await ask_human("When do you train?")
+
+            task = asyncio.create_task(specialist())
+            set_current_specialist("Strength Coach")
+            may_ask.set()
+            result = await task
+        finally:
+            set_question_callback(None)
+
+        assert asked == [("Strength Coach", "When do you train?")]
+        assert result["answer"] == "Mornings"